@@ -2,6 +2,9 @@
 Configuration settings for the next-generation MOT OCR system using Vision-Language Models.
 """
 import os
+import re
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from pydantic import BaseSettings, Field
 
@@ -107,14 +110,33 @@ class Settings(BaseSettings):
     # Performance Configuration
     max_concurrent_requests: int = Field(default=10, env="MAX_CONCURRENT_REQUESTS")
     request_timeout: int = Field(default=300, env="REQUEST_TIMEOUT")  # 5 minutes
+    model_timeout: int = Field(default=120, env="MODEL_TIMEOUT")  # per-ensemble-run cap
+    max_concurrent_model_calls: int = Field(default=4, env="MAX_CONCURRENT_MODEL_CALLS")
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the cached Settings instance, parsing the environment only once."""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
+
+# Resolved storage paths, created exactly once per process so startup hooks
+# and file handlers never repeat the mkdir/stat work
+UPLOAD_PATH = Path(settings.upload_dir)
+RESULTS_PATH = Path(settings.results_dir)
+LOGS_PATH = Path("logs")
+for _path in (UPLOAD_PATH, RESULTS_PATH, LOGS_PATH):
+    _path.mkdir(parents=True, exist_ok=True)
+
+# Allowed upload extensions as a frozenset for O(1) membership checks
+ALLOWED_EXTENSIONS_SET = frozenset(e.lower() for e in settings.allowed_extensions)
 
 
 # UK MOT Date Validation Patterns
@@ -125,6 +147,40 @@ MOT_DATE_PATTERNS = [
     r"\d{4}-\d{2}-\d{2}",  # YYYY-MM-DD
 ]
 
+# Precompiled pattern objects - compiled once at import so the hot
+# extraction path never re-parses regex source strings per request
+UK_REGISTRATION_REGEXES = [re.compile(p) for p in settings.uk_registration_patterns]
+MOT_DATE_REGEXES = [re.compile(p) for p in MOT_DATE_PATTERNS]
+
+# Fused alternations: one match attempt classifies a string instead of
+# trying each pattern in turn
+UK_REGISTRATION_COMBINED_REGEX = re.compile(
+    "|".join(f"(?:{p})" for p in settings.uk_registration_patterns)
+)
+MOT_DATE_COMBINED_REGEX = re.compile(
+    "|".join(f"(?:{p})" for p in MOT_DATE_PATTERNS)
+)
+
+
+def match_registration(candidate: str) -> Optional[int]:
+    """
+    Classify a candidate string against the UK registration patterns.
+
+    Args:
+        candidate: Normalized registration candidate
+
+    Returns:
+        Index into uk_registration_patterns of the matching pattern, or None
+    """
+    # One pass over the fused alternation rejects non-matches without
+    # trying each pattern in turn; only matches pay for the index lookup
+    if UK_REGISTRATION_COMBINED_REGEX.match(candidate) is None:
+        return None
+    for i, regex in enumerate(UK_REGISTRATION_REGEXES):
+        if regex.match(candidate):
+            return i
+    return None
+
 # Common garage management software field mappings
 FIELD_MAPPINGS = {
     "registration": ["reg", "registration", "reg_no", "vehicle_reg", "number_plate"],
@@ -11,7 +11,9 @@ from pathlib import Path
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from config.settings import settings
+from config.settings import get_settings
+
+settings = get_settings()
 from src.utils.logger import setup_logger
 
 # Setup logging
@@ -40,16 +42,11 @@ def check_environment():
 
 
 def create_directories():
-    """Create necessary directories."""
-    directories = [
-        settings.upload_dir,
-        settings.results_dir,
-        "logs"
-    ]
-    
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
-        logger.info(f"Created directory: {directory}")
+    """Report storage directories (created once on config.settings import)."""
+    from config.settings import UPLOAD_PATH, RESULTS_PATH, LOGS_PATH
+
+    for directory in (UPLOAD_PATH, RESULTS_PATH, LOGS_PATH):
+        logger.info(f"Using directory: {directory}")
 
 
 async def health_check():
@@ -102,11 +99,19 @@ def main():
     
     # Start the server
     try:
+        # uvloop + httptools replace the default asyncio loop and h11 parser;
+        # multiple workers are safe because the pipeline builds its models
+        # lazily per process rather than at import. Reload mode disables
+        # workers, so debug runs stay single-process.
+        workers = 1 if settings.api_debug else (os.cpu_count() or 1)
         uvicorn.run(
             "src.api.main:app",
             host=settings.api_host,
             port=settings.api_port,
             reload=settings.api_debug,
+            workers=workers,
+            loop="uvloop",
+            http="httptools",
             log_level=settings.log_level.lower(),
             access_log=True
         )
@@ -1,37 +1,50 @@
 """
 FastAPI application for MOT OCR system.
 """
-import os
 import time
 import uuid
+from functools import lru_cache
+from statistics import fmean
 from typing import List, Optional
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import uvicorn
 
 from .models import (
-    MOTExtractionResponse, 
+    MOTExtractionResponse,
     MOTExtractionRequest,
     HealthCheckResponse,
-    ValidationResponse
+    ValidationResponse,
+    dump_dvla_validation,
+    dump_dvla_vehicle_info
 )
 from ..pipeline.ensemble_pipeline import EnsemblePipeline
 from ..dvla.api_client import DVLAAPIClient
 from ..utils.file_handler import FileHandler
 from ..utils.logger import setup_logger
-from config.settings import settings
+from config.settings import get_settings, ALLOWED_EXTENSIONS_SET
+
+settings = get_settings()
 
 # Initialize logger
 logger = setup_logger(__name__)
 
+# Settings values read on request paths, bound once at import so handlers
+# avoid repeated pydantic attribute lookups
+_ENSEMBLE_STRATEGY = settings.ensemble_voting_strategy
+_MODEL_WEIGHTS = settings.model_weights
+_MAX_FILE_SIZE = settings.max_file_size
+_ALLOWED_EXTS = ALLOWED_EXTENSIONS_SET
+
 # Initialize FastAPI app
 app = FastAPI(
     title="MOT OCR System",
     description="High-accuracy MOT reminder data extraction using Vision-Language Models",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -43,22 +56,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize components
-ensemble_pipeline = EnsemblePipeline()
-dvla_client = DVLAAPIClient()
-file_handler = FileHandler()
+# Lazily constructed singletons - building the pipeline is expensive
+# (model clients, possible Florence-2 load), so defer it out of import time
+@lru_cache(maxsize=1)
+def get_pipeline() -> EnsemblePipeline:
+    """Return the shared ensemble pipeline instance."""
+    return EnsemblePipeline()
+
+
+@lru_cache(maxsize=1)
+def get_dvla_client() -> DVLAAPIClient:
+    """Return the shared DVLA API client instance."""
+    return DVLAAPIClient()
+
+
+@lru_cache(maxsize=1)
+def get_file_handler() -> FileHandler:
+    """Return the shared file handler instance."""
+    return FileHandler()
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup."""
     logger.info("Starting MOT OCR System")
-    
-    # Create necessary directories
-    os.makedirs(settings.upload_dir, exist_ok=True)
-    os.makedirs(settings.results_dir, exist_ok=True)
-    os.makedirs("logs", exist_ok=True)
-    
+
+    # Directories are created once when config.settings is imported
+
+    # Warm the singletons so the first request doesn't pay construction cost
+    get_pipeline()
+    get_dvla_client()
+    get_file_handler()
+
     logger.info("MOT OCR System started successfully")
 
 
@@ -66,10 +95,14 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on application shutdown."""
     logger.info("Shutting down MOT OCR System")
+    await get_pipeline().aclose()
+    await get_dvla_client().aclose()
 
 
 @app.get("/health", response_model=HealthCheckResponse)
-async def health_check():
+async def health_check(
+    ensemble_pipeline: EnsemblePipeline = Depends(get_pipeline)
+):
     """Health check endpoint."""
     return HealthCheckResponse(
         status="healthy",
@@ -85,7 +118,10 @@ async def extract_mot_data(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     validate_with_dvla: bool = True,
-    confidence_threshold: float = 0.85
+    confidence_threshold: float = 0.85,
+    ensemble_pipeline: EnsemblePipeline = Depends(get_pipeline),
+    dvla_client: DVLAAPIClient = Depends(get_dvla_client),
+    file_handler: FileHandler = Depends(get_file_handler)
 ):
     """
     Extract MOT reminder data from garage management software screenshot.
@@ -98,9 +134,10 @@ async def extract_mot_data(
     Returns:
         MOTExtractionResponse with extracted data and validation results
     """
-    request_id = str(uuid.uuid4())
-    start_time = time.time()
-    
+    monotonic_ns = time.monotonic_ns  # bind once; called again on every exit path
+    request_id = uuid.uuid4().hex
+    start_time = monotonic_ns()
+
     logger.info(f"Processing MOT extraction request {request_id}")
     
     try:
@@ -110,14 +147,14 @@ async def extract_mot_data(
         
         if not file_handler.is_valid_image_file(file.filename):
             raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid file type. Allowed: {settings.allowed_extensions}"
+                status_code=400,
+                detail=f"Invalid file type. Allowed: {sorted(_ALLOWED_EXTS)}"
             )
-        
-        if file.size and file.size > settings.max_file_size:
+
+        if file.size and file.size > _MAX_FILE_SIZE:
             raise HTTPException(
                 status_code=400,
-                detail=f"File too large. Maximum size: {settings.max_file_size} bytes"
+                detail=f"File too large. Maximum size: {_MAX_FILE_SIZE} bytes"
             )
         
         # Save uploaded file
@@ -138,7 +175,7 @@ async def extract_mot_data(
             
             # Calculate final confidence score
             final_confidence = ensemble_result.final_extraction.confidence_scores
-            avg_confidence = sum(final_confidence.values()) / len(final_confidence) if final_confidence else 0.0
+            avg_confidence = fmean(final_confidence.values()) if final_confidence else 0.0
             
             # Determine if manual review is required
             requires_manual_review = (
@@ -147,8 +184,8 @@ async def extract_mot_data(
                 (dvla_validation and not dvla_validation.is_valid)
             )
             
-            processing_time = time.time() - start_time
-            
+            processing_time = (monotonic_ns() - start_time) / 1e9
+
             # Create response
             response = MOTExtractionResponse(
                 request_id=request_id,
@@ -168,7 +205,7 @@ async def extract_mot_data(
                 models_used=ensemble_result.models_used,
                 agreement_level=ensemble_result.agreement_level,
                 validation_results=ensemble_result.validation_results,
-                dvla_validation=dvla_validation.__dict__ if dvla_validation else None,
+                dvla_validation=dump_dvla_validation(dvla_validation) if dvla_validation else None,
                 requires_manual_review=requires_manual_review,
                 error_message=None
             )
@@ -187,7 +224,7 @@ async def extract_mot_data(
     except HTTPException:
         raise
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = (monotonic_ns() - start_time) / 1e9
         logger.error(f"Error processing request {request_id}: {str(e)}")
         
         return MOTExtractionResponse(
@@ -207,7 +244,10 @@ async def extract_mot_data(
 
 
 @app.post("/validate-registration", response_model=ValidationResponse)
-async def validate_registration(registration: str):
+async def validate_registration(
+    registration: str,
+    dvla_client: DVLAAPIClient = Depends(get_dvla_client)
+):
     """
     Validate a UK vehicle registration number.
     
@@ -224,7 +264,7 @@ async def validate_registration(registration: str):
         return ValidationResponse(
             registration=registration,
             is_valid=dvla_result.is_valid,
-            dvla_info=dvla_result.vehicle_info.__dict__ if dvla_result.vehicle_info else None,
+            dvla_info=dump_dvla_vehicle_info(dvla_result.vehicle_info) if dvla_result.vehicle_info else None,
             error_message=dvla_result.error_message,
             response_time=dvla_result.response_time
         )
@@ -241,10 +281,12 @@ async def validate_registration(registration: str):
 
 
 @app.get("/models/info")
-async def get_models_info():
+async def get_models_info(
+    ensemble_pipeline: EnsemblePipeline = Depends(get_pipeline)
+):
     """Get information about available vision models."""
     models_info = []
-    
+
     for model in ensemble_pipeline.models:
         if hasattr(model, 'get_model_info'):
             models_info.append(model.get_model_info())
@@ -252,8 +294,8 @@ async def get_models_info():
     return {
         "available_models": len(ensemble_pipeline.models),
         "models": models_info,
-        "ensemble_strategy": settings.ensemble_voting_strategy,
-        "model_weights": settings.model_weights
+        "ensemble_strategy": _ENSEMBLE_STRATEGY,
+        "model_weights": _MODEL_WEIGHTS
     }
 
 
@@ -2,10 +2,19 @@
 Pydantic models for API requests and responses.
 """
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from datetime import datetime
 
 
+class ResponseModel(BaseModel):
+    """Base class for response-only models.
+
+    Responses are built from already-validated internal data, so schema
+    construction is deferred until first use and revalidation stays cheap.
+    """
+    model_config = ConfigDict(defer_build=True, extra='ignore', validate_assignment=False)
+
+
 class MOTExtractionRequest(BaseModel):
     """Request model for MOT data extraction."""
     validate_with_dvla: bool = Field(default=True, description="Whether to validate with DVLA API")
@@ -36,19 +45,21 @@ class ConfidenceScores(BaseModel):
 
 class DVLAVehicleInfo(BaseModel):
     """DVLA vehicle information."""
+    model_config = ConfigDict(from_attributes=True)
+
     registration_number: str
     make: str
     model: str
     colour: str
     fuel_type: str
     engine_capacity: Optional[int] = None
-    date_of_first_registration: Optional[str] = None
+    date_of_first_registration: Optional[datetime] = None
     year_of_manufacture: Optional[int] = None
     co2_emissions: Optional[int] = None
     mot_status: Optional[str] = None
-    mot_expiry_date: Optional[str] = None
+    mot_expiry_date: Optional[datetime] = None
     tax_status: Optional[str] = None
-    tax_due_date: Optional[str] = None
+    tax_due_date: Optional[datetime] = None
     type_approval: Optional[str] = None
     wheelplan: Optional[str] = None
     revenue_weight: Optional[int] = None
@@ -56,6 +67,8 @@ class DVLAVehicleInfo(BaseModel):
 
 class DVLAValidation(BaseModel):
     """DVLA validation result."""
+    model_config = ConfigDict(from_attributes=True)
+
     is_valid: bool
     vehicle_info: Optional[DVLAVehicleInfo] = None
     error_message: Optional[str] = None
@@ -63,7 +76,32 @@ class DVLAValidation(BaseModel):
     api_status_code: Optional[int] = None
 
 
-class MOTExtractionResponse(BaseModel):
+# Reusable adapters for the DVLA object -> response dict conversion on the
+# two serving paths; building a TypeAdapter compiles its validator and
+# serializer once, so these live at module scope
+VEHICLE_INFO_ADAPTER = TypeAdapter(DVLAVehicleInfo)
+VALIDATION_ADAPTER = TypeAdapter(DVLAValidation)
+
+
+def dump_dvla_validation(result) -> Dict[str, Any]:
+    """Serialize a DVLA validation result to a JSON-ready dict.
+
+    mode="json" renders the datetime fields as ISO-8601 strings up front,
+    sparing the response encoder a per-field fallback pass.
+    """
+    return VALIDATION_ADAPTER.dump_python(
+        VALIDATION_ADAPTER.validate_python(result), mode="json"
+    )
+
+
+def dump_dvla_vehicle_info(info) -> Dict[str, Any]:
+    """Serialize DVLA vehicle info to a JSON-ready dict."""
+    return VEHICLE_INFO_ADAPTER.dump_python(
+        VEHICLE_INFO_ADAPTER.validate_python(info), mode="json"
+    )
+
+
+class MOTExtractionResponse(ResponseModel):
     """Response model for MOT data extraction."""
     request_id: str = Field(description="Unique request identifier")
     success: bool = Field(description="Whether extraction was successful")
@@ -79,7 +117,7 @@ class MOTExtractionResponse(BaseModel):
     error_message: Optional[str] = Field(description="Error message if extraction failed")
 
 
-class ValidationResponse(BaseModel):
+class ValidationResponse(ResponseModel):
     """Response model for registration validation."""
     registration: str = Field(description="Registration number validated")
     is_valid: bool = Field(description="Whether registration is valid")
@@ -88,7 +126,7 @@ class ValidationResponse(BaseModel):
     response_time: float = Field(description="DVLA API response time")
 
 
-class HealthCheckResponse(BaseModel):
+class HealthCheckResponse(ResponseModel):
     """Health check response."""
     status: str = Field(description="System status")
     timestamp: float = Field(description="Current timestamp")
@@ -107,7 +145,7 @@ class ModelInfo(BaseModel):
     supported_formats: List[str] = Field(description="Supported image formats")
 
 
-class ModelsInfoResponse(BaseModel):
+class ModelsInfoResponse(ResponseModel):
     """Response for models information."""
     available_models: int = Field(description="Number of available models")
     models: List[ModelInfo] = Field(description="Detailed model information")
@@ -122,7 +160,7 @@ class BatchExtractionRequest(BaseModel):
     max_concurrent: int = Field(default=3, ge=1, le=10, description="Maximum concurrent processing")
 
 
-class BatchExtractionResponse(BaseModel):
+class BatchExtractionResponse(ResponseModel):
     """Response model for batch MOT data extraction."""
     batch_id: str = Field(description="Unique batch identifier")
     total_files: int = Field(description="Total number of files processed")
@@ -133,7 +171,7 @@ class BatchExtractionResponse(BaseModel):
     summary: Dict[str, Any] = Field(description="Batch processing summary")
 
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(ResponseModel):
     """Error response model."""
     error: str = Field(description="Error type")
     message: str = Field(description="Error message")
@@ -142,7 +180,7 @@ class ErrorResponse(BaseModel):
     request_id: Optional[str] = Field(description="Request ID if available")
 
 
-class ConfigurationResponse(BaseModel):
+class ConfigurationResponse(ResponseModel):
     """System configuration response."""
     version: str = Field(description="System version")
     supported_formats: List[str] = Field(description="Supported image formats")
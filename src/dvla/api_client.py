@@ -2,18 +2,52 @@
 DVLA Vehicle Enquiry Service API client for registration validation.
 """
 import asyncio
+import string
+import time
 import httpx
-from typing import Dict, Any, Optional
+import orjson
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 
 from config.settings import settings
 
+def _parse_iso_date(date_string: str) -> Optional[datetime]:
+    """Parse a fixed-shape YYYY-MM-DD string without the strptime format machinery."""
+    try:
+        return datetime(int(date_string[0:4]), int(date_string[5:7]), int(date_string[8:10]))
+    except (ValueError, IndexError):
+        return None
 
-@dataclass
+
+def _parse_ddmmyyyy(date_string: str) -> Optional[datetime]:
+    """Parse a fixed-shape DD/MM/YYYY string without the strptime format machinery."""
+    try:
+        return datetime(int(date_string[6:10]), int(date_string[3:5]), int(date_string[0:2]))
+    except (ValueError, IndexError):
+        return None
+
+
+# Registration normalization table: lowercase maps to uppercase and every
+# other non-alphanumeric Latin-1 character is dropped, all in one C-level pass
+_NORMALIZE_TABLE = str.maketrans(
+    string.ascii_lowercase,
+    string.ascii_uppercase,
+    ''.join(
+        chr(i) for i in range(256)
+        if chr(i) not in string.ascii_letters and chr(i) not in string.digits
+    )
+)
+
+
+@dataclass(slots=True, frozen=True)
 class DVLAVehicleInfo:
-    """DVLA vehicle information."""
+    """DVLA vehicle information.
+
+    Invariant: ``registration_number`` is stored normalized (uppercase,
+    alphanumerics only), as produced by the client before the API call.
+    """
     registration_number: str
     make: str
     model: str
@@ -31,8 +65,29 @@ class DVLAVehicleInfo:
     wheelplan: Optional[str]
     revenue_weight: Optional[int]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Project vehicle info into a response payload dict."""
+        return {
+            'registration_number': self.registration_number,
+            'make': self.make,
+            'model': self.model,
+            'colour': self.colour,
+            'fuel_type': self.fuel_type,
+            'engine_capacity': self.engine_capacity,
+            'date_of_first_registration': self.date_of_first_registration,
+            'year_of_manufacture': self.year_of_manufacture,
+            'co2_emissions': self.co2_emissions,
+            'mot_status': self.mot_status,
+            'mot_expiry_date': self.mot_expiry_date,
+            'tax_status': self.tax_status,
+            'tax_due_date': self.tax_due_date,
+            'type_approval': self.type_approval,
+            'wheelplan': self.wheelplan,
+            'revenue_weight': self.revenue_weight,
+        }
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DVLAValidationResult:
     """Result of DVLA validation."""
     is_valid: bool
@@ -41,18 +96,96 @@ class DVLAValidationResult:
     response_time: float
     api_status_code: Optional[int]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Project the validation result into a response payload dict."""
+        return {
+            'is_valid': self.is_valid,
+            'vehicle_info': self.vehicle_info.to_dict() if self.vehicle_info else None,
+            'error_message': self.error_message,
+            'response_time': self.response_time,
+            'api_status_code': self.api_status_code,
+        }
+
 
 class DVLAAPIClient:
     """Client for DVLA Vehicle Enquiry Service API."""
-    
+
+    # In-process response cache: successful lookups are stable for minutes,
+    # not-found answers can change soon after (new registrations)
+    CACHE_TTL_OK = 300.0
+    CACHE_TTL_NOT_FOUND = 30.0
+    CACHE_MAX_ENTRIES = 4096
+
     def __init__(self):
         self.api_key = settings.dvla_api_key
         self.api_url = settings.dvla_api_url
         self.timeout = settings.dvla_timeout
         self.logger = logging.getLogger(__name__)
-        
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cache: Dict[str, tuple] = {}
+
         if not self.api_key:
             self.logger.warning("DVLA API key not configured - validation will be skipped")
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it lazily on first use.
+
+        Reusing one client keeps DNS, TCP and TLS state alive across calls
+        instead of paying connection setup per registration.
+        """
+        if self._client is None:
+            max_concurrent = settings.max_concurrent_requests
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                # HTTP/2 lets batch lookups multiplex one TCP+TLS session;
+                # httpx negotiates via ALPN and falls back to HTTP/1.1
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=max_concurrent,
+                    max_connections=max_concurrent * 2,
+                    keepalive_expiry=30.0
+                ),
+                headers={
+                    'x-api-key': self.api_key,
+                    'Content-Type': 'application/json'
+                }
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared HTTP client (for shutdown hooks)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _cache_get(self, normalized_reg: str) -> Optional[DVLAValidationResult]:
+        """Return a cached, unexpired validation result or None."""
+        entry = self._cache.get(normalized_reg)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[normalized_reg]
+            return None
+        return result
+
+    def _cache_put(self, normalized_reg: str, result: DVLAValidationResult):
+        """Cache a validation result with a status-dependent TTL."""
+        # Only definitive answers are cached: a found vehicle (200) or a
+        # confirmed miss (404). Anything else — timeouts, 5xx, and above
+        # all 429 throttling — says nothing about the registration, and
+        # caching it would report the plate invalid for the TTL just
+        # because DVLA rate-limited the first lookup.
+        if result.api_status_code not in (200, 404):
+            return
+
+        ttl = self.CACHE_TTL_OK if result.is_valid else self.CACHE_TTL_NOT_FOUND
+
+        if len(self._cache) >= self.CACHE_MAX_ENTRIES:
+            # FIFO eviction: drop the oldest insertion
+            self._cache.pop(next(iter(self._cache)), None)
+
+        self._cache[normalized_reg] = (time.monotonic() + ttl, result)
     
     async def validate_registration(self, registration: str) -> DVLAValidationResult:
         """
@@ -84,55 +217,80 @@ class DVLAAPIClient:
         
         # Normalize registration for API call
         normalized_reg = self._normalize_registration(registration)
-        
-        start_time = asyncio.get_event_loop().time()
-        
+
+        # Serve repeat lookups (retries, batch duplicates, re-uploads) from
+        # the in-process cache instead of re-hitting DVLA
+        cached = self._cache_get(normalized_reg)
+        if cached is not None:
+            return cached
+
+        result = await self._fetch_validation(normalized_reg)
+        self._cache_put(normalized_reg, result)
+        return result
+
+    async def _fetch_validation(self, normalized_reg: str) -> DVLAValidationResult:
+        """
+        Perform the actual DVLA API lookup for a normalized registration.
+
+        Args:
+            normalized_reg: Normalized registration number
+
+        Returns:
+            DVLAValidationResult with vehicle information or error
+        """
+        start_time = time.perf_counter()
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await self._make_api_request(client, normalized_reg)
-                
-                response_time = asyncio.get_event_loop().time() - start_time
-                
-                if response.status_code == 200:
-                    vehicle_data = response.json()
-                    vehicle_info = self._parse_vehicle_data(vehicle_data, normalized_reg)
-                    
-                    return DVLAValidationResult(
-                        is_valid=True,
-                        vehicle_info=vehicle_info,
-                        error_message=None,
-                        response_time=response_time,
-                        api_status_code=response.status_code
-                    )
-                
-                elif response.status_code == 404:
-                    return DVLAValidationResult(
-                        is_valid=False,
-                        vehicle_info=None,
-                        error_message="Vehicle not found in DVLA database",
-                        response_time=response_time,
-                        api_status_code=response.status_code
-                    )
+            client = self._get_client()
+            response = await self._make_api_request(client, normalized_reg)
+
+            response_time = time.perf_counter() - start_time
+
+            if response.status_code == 200:
+                vehicle_data = orjson.loads(response.content)
+                vehicle_info = self._parse_vehicle_data(vehicle_data, normalized_reg)
                 
-                else:
-                    error_msg = f"DVLA API error: {response.status_code}"
+                return DVLAValidationResult(
+                    is_valid=True,
+                    vehicle_info=vehicle_info,
+                    error_message=None,
+                    response_time=response_time,
+                    api_status_code=response.status_code
+                )
+            
+            elif response.status_code == 404:
+                return DVLAValidationResult(
+                    is_valid=False,
+                    vehicle_info=None,
+                    error_message="Vehicle not found in DVLA database",
+                    response_time=response_time,
+                    api_status_code=response.status_code
+                )
+            
+            else:
+                error_msg = f"DVLA API error: {response.status_code}"
+                # Only parse the body when it claims to be JSON, and cap the
+                # bytes inspected so error floods (HTML pages, rate-limit
+                # blobs) don't burn CPU
+                content_type = response.headers.get('content-type', '')
+                if content_type.startswith('application/json'):
                     try:
-                        error_data = response.json()
+                        error_data = orjson.loads(response.content[:4096])
                         if 'message' in error_data:
                             error_msg += f" - {error_data['message']}"
-                    except:
+                    except orjson.JSONDecodeError:
                         pass
-                    
-                    return DVLAValidationResult(
-                        is_valid=False,
-                        vehicle_info=None,
-                        error_message=error_msg,
-                        response_time=response_time,
-                        api_status_code=response.status_code
-                    )
+                
+                return DVLAValidationResult(
+                    is_valid=False,
+                    vehicle_info=None,
+                    error_message=error_msg,
+                    response_time=response_time,
+                    api_status_code=response.status_code
+                )
         
         except httpx.TimeoutException:
-            response_time = asyncio.get_event_loop().time() - start_time
+            response_time = time.perf_counter() - start_time
             return DVLAValidationResult(
                 is_valid=False,
                 vehicle_info=None,
@@ -142,7 +300,7 @@ class DVLAAPIClient:
             )
         
         except Exception as e:
-            response_time = asyncio.get_event_loop().time() - start_time
+            response_time = time.perf_counter() - start_time
             self.logger.error(f"DVLA API error for registration {normalized_reg}: {str(e)}")
             return DVLAValidationResult(
                 is_valid=False,
@@ -152,6 +310,37 @@ class DVLAAPIClient:
                 api_status_code=None
             )
     
+    async def validate_registrations(
+        self,
+        registrations: List[str],
+        max_concurrent: Optional[int] = None
+    ) -> List[DVLAValidationResult]:
+        """
+        Validate several registration numbers concurrently.
+
+        Args:
+            registrations: Registration numbers to validate
+            max_concurrent: Concurrency cap (defaults to settings.max_concurrent_requests)
+
+        Returns:
+            List of DVLAValidationResult in the same order as the input
+        """
+        if not registrations:
+            return []
+
+        # Dispatch all lookups at once so DVLA roundtrips overlap; the
+        # semaphore bounds in-flight requests so large batches don't swamp
+        # the connection pool or the DVLA rate limit
+        semaphore = asyncio.Semaphore(max_concurrent or settings.max_concurrent_requests)
+
+        async def _validate_one(reg: str) -> DVLAValidationResult:
+            async with semaphore:
+                return await self.validate_registration(reg)
+
+        return list(await asyncio.gather(
+            *(_validate_one(reg) for reg in registrations)
+        ))
+
     async def _make_api_request(self, client: httpx.AsyncClient, registration: str) -> httpx.Response:
         """
         Make the actual API request to DVLA.
@@ -163,21 +352,13 @@ class DVLAAPIClient:
         Returns:
             HTTP response
         """
-        headers = {
-            'x-api-key': self.api_key,
-            'Content-Type': 'application/json'
-        }
-        
         payload = {
             'registrationNumber': registration
         }
-        
-        response = await client.post(
-            self.api_url,
-            json=payload,
-            headers=headers
-        )
-        
+
+        # Auth and content-type headers are bound on the shared client
+        response = await client.post(self.api_url, json=payload)
+
         return response
     
     def _normalize_registration(self, registration: str) -> str:
@@ -190,13 +371,8 @@ class DVLAAPIClient:
         Returns:
             Normalized registration string
         """
-        # Remove spaces and convert to uppercase
-        normalized = registration.replace(' ', '').upper()
-        
-        # Remove any non-alphanumeric characters
-        normalized = ''.join(c for c in normalized if c.isalnum())
-        
-        return normalized
+        # Uppercase and strip non-alphanumerics in a single translate pass
+        return registration.translate(_NORMALIZE_TABLE)
     
     def _parse_vehicle_data(self, data: Dict[str, Any], registration: str) -> DVLAVehicleInfo:
         """
@@ -209,33 +385,18 @@ class DVLAAPIClient:
         Returns:
             DVLAVehicleInfo object
         """
-        # Parse dates
+        # Parse dates (fixed YYYY-MM-DD shape, no strptime overhead)
         date_of_first_registration = None
         if data.get('dateOfFirstRegistration'):
-            try:
-                date_of_first_registration = datetime.strptime(
-                    data['dateOfFirstRegistration'], '%Y-%m-%d'
-                )
-            except ValueError:
-                pass
-        
+            date_of_first_registration = _parse_iso_date(data['dateOfFirstRegistration'])
+
         mot_expiry_date = None
         if data.get('motExpiryDate'):
-            try:
-                mot_expiry_date = datetime.strptime(
-                    data['motExpiryDate'], '%Y-%m-%d'
-                )
-            except ValueError:
-                pass
-        
+            mot_expiry_date = _parse_iso_date(data['motExpiryDate'])
+
         tax_due_date = None
         if data.get('taxDueDate'):
-            try:
-                tax_due_date = datetime.strptime(
-                    data['taxDueDate'], '%Y-%m-%d'
-                )
-            except ValueError:
-                pass
+            tax_due_date = _parse_iso_date(data['taxDueDate'])
         
         return DVLAVehicleInfo(
             registration_number=registration,
@@ -273,43 +434,32 @@ class DVLAAPIClient:
         """
         comparisons = {}
         
-        # Compare registration (should match exactly)
+        # Compare registration (should match exactly); the DVLA side is
+        # already normalized by _parse_vehicle_data, so only the extracted
+        # value needs the normalization pass
         extracted_reg = self._normalize_registration(extracted_data.get('registration', ''))
-        dvla_reg = self._normalize_registration(dvla_info.registration_number)
-        comparisons['registration'] = extracted_reg == dvla_reg
-        
-        # Compare make (case-insensitive, partial match allowed)
-        extracted_make = extracted_data.get('make', '').upper()
-        dvla_make = dvla_info.make.upper()
-        if extracted_make and dvla_make:
-            comparisons['make'] = (
-                extracted_make in dvla_make or 
-                dvla_make in extracted_make or
-                extracted_make == dvla_make
-            )
-        else:
-            comparisons['make'] = False
+        comparisons['registration'] = extracted_reg == dvla_info.registration_number
         
-        # Compare model (case-insensitive, partial match allowed)
-        extracted_model = extracted_data.get('model', '').upper()
-        dvla_model = dvla_info.model.upper()
-        if extracted_model and dvla_model:
-            comparisons['model'] = (
-                extracted_model in dvla_model or 
-                dvla_model in extracted_model or
-                extracted_model == dvla_model
-            )
-        else:
-            comparisons['model'] = False
+        # Compare make/model (case-insensitive, partial match allowed);
+        # uppercase each side exactly once and short-circuit on empties
+        em = extracted_data.get('make', '').upper()
+        dm = dvla_info.make.upper()
+        comparisons['make'] = bool(em) and bool(dm) and (em == dm or em in dm or dm in em)
+
+        emod = extracted_data.get('model', '').upper()
+        dmod = dvla_info.model.upper()
+        comparisons['model'] = bool(emod) and bool(dmod) and (
+            emod == dmod or emod in dmod or dmod in emod
+        )
         
         # Compare MOT expiry date
         extracted_mot = extracted_data.get('mot_expiry', '')
         if extracted_mot and dvla_info.mot_expiry_date:
-            try:
-                extracted_date = datetime.strptime(extracted_mot, '%d/%m/%Y')
-                comparisons['mot_expiry'] = extracted_date.date() == dvla_info.mot_expiry_date.date()
-            except ValueError:
-                comparisons['mot_expiry'] = False
+            extracted_date = _parse_ddmmyyyy(extracted_mot)
+            comparisons['mot_expiry'] = (
+                extracted_date is not None and
+                extracted_date.date() == dvla_info.mot_expiry_date.date()
+            )
         else:
             comparisons['mot_expiry'] = False
         
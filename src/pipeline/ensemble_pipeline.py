@@ -2,10 +2,13 @@
 Ensemble pipeline that combines multiple Vision-Language Models for maximum accuracy.
 """
 import asyncio
+import hashlib
 import time
-from typing import List, Dict, Any, Optional
+
+import httpx
+from collections import Counter, OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-from statistics import mean, median
 import re
 
 from ..vision_models.base_vision_model import BaseVisionModel, ExtractionResult, ModelConfig
@@ -15,6 +18,7 @@ from ..vision_models.gemini_vision import GeminiVisionModel
 from ..vision_models.florence_vision import FlorenceVisionModel
 from ..validation.uk_registration_validator import UKRegistrationValidator
 from ..validation.date_validator import DateValidator
+from ..utils.logger import ensemble_logger
 from config.settings import settings
 
 
@@ -31,18 +35,66 @@ class EnsembleResult:
     requires_manual_review: bool
 
 
+# Whitespace stripper for value normalization, compiled once at import
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Fields that participate in consensus, in output order
+CONSENSUS_FIELDS = ('registration', 'mot_expiry', 'make', 'model',
+                    'customer_name', 'customer_phone', 'customer_email')
+
+
 class EnsemblePipeline:
     """Ensemble pipeline combining multiple vision models for maximum accuracy."""
 
+    # Early-exit thresholds: stop dispatching models once this many results
+    # agree on the critical fields at or above this confidence
+    EARLY_EXIT_MIN_MODELS = 2
+    EARLY_EXIT_CONFIDENCE = 0.9
+    EARLY_EXIT_FIELDS = ('registration', 'mot_expiry')
+
+    # Content-addressed result cache: identical re-uploads and retry storms
+    # skip the whole ensemble
+    RESULT_CACHE_SIZE = 128
+
     def __init__(self):
-        self.models: List[BaseVisionModel] = []
+        self._models: Optional[List[BaseVisionModel]] = None
         self.model_weights = settings.model_weights
+        self._model_weight_by_idx: tuple = ()
         self.registration_validator = UKRegistrationValidator()
         self.date_validator = DateValidator()
-        self._initialize_models()
+        # Bound in-flight work: API-backed models share one cap, while
+        # Florence-2 GPU inference is serialized to keep VRAM bounded
+        self._api_sem = asyncio.Semaphore(settings.max_concurrent_model_calls)
+        self._gpu_sem = asyncio.Semaphore(1)
+        self._result_cache: "OrderedDict[str, EnsembleResult]" = OrderedDict()
+        # One HTTP/2 connection pool shared by every model whose SDK accepts
+        # an external client, so repeated calls reuse warm TLS connections
+        self._http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+            timeout=settings.model_timeout,
+        )
 
-    def _initialize_models(self):
+    @property
+    def models(self) -> List[BaseVisionModel]:
+        """Vision models, materialized lazily on first access.
+
+        Model construction is deferred so that importing or constructing the
+        pipeline never pays for heavy client setup (Florence-2 weights/CUDA
+        in particular) until a request actually needs the models.
+        """
+        if self._models is None:
+            self._models = self._initialize_models()
+            # Freeze each model's ensemble weight by position so consensus
+            # indexes a tuple instead of hashing model names per result
+            self._model_weight_by_idx = tuple(
+                self.model_weights.get(m.model_name, 0.1) for m in self._models
+            )
+        return self._models
+
+    def _initialize_models(self) -> List[BaseVisionModel]:
         """Initialize all available vision models."""
+        models: List[BaseVisionModel] = []
         try:
             # Initialize Claude 3.5 Sonnet
             if settings.anthropic_api_key:
@@ -52,7 +104,7 @@ class EnsemblePipeline:
                     max_tokens=settings.claude_max_tokens,
                     temperature=settings.claude_temperature
                 )
-                self.models.append(ClaudeVisionModel(claude_config))
+                models.append(ClaudeVisionModel(claude_config, http_client=self._http))
 
             # Initialize GPT-4 Vision
             if settings.openai_api_key:
@@ -62,7 +114,7 @@ class EnsemblePipeline:
                     max_tokens=settings.openai_max_tokens,
                     temperature=settings.openai_temperature
                 )
-                self.models.append(GPT4VisionModel(gpt4v_config))
+                models.append(GPT4VisionModel(gpt4v_config, http_client=self._http))
 
             # Initialize Gemini Pro Vision
             if settings.google_api_key:
@@ -71,7 +123,7 @@ class EnsemblePipeline:
                     model_name=settings.gemini_model,
                     temperature=settings.gemini_temperature
                 )
-                self.models.append(GeminiVisionModel(gemini_config))
+                models.append(GeminiVisionModel(gemini_config))
 
             # Initialize Florence-2 (local model, no API key required)
             try:
@@ -79,14 +131,20 @@ class EnsemblePipeline:
                     api_key="",  # Not needed for local model
                     model_name=settings.florence_model
                 )
-                self.models.append(FlorenceVisionModel(florence_config))
+                models.append(FlorenceVisionModel(florence_config))
             except Exception as e:
                 # Florence-2 is optional, continue without it if it fails
-                print(f"Warning: Could not initialize Florence-2: {str(e)}")
+                ensemble_logger.warning(f"Could not initialize Florence-2: {str(e)}")
 
         except Exception as e:
             raise RuntimeError(f"Failed to initialize vision models: {str(e)}")
 
+        return models
+
+    async def aclose(self):
+        """Close the shared HTTP connection pool; call on application shutdown."""
+        await self._http.aclose()
+
     async def process_screenshot(self, image_path: str) -> EnsembleResult:
         """
         Process screenshot using ensemble of vision models.
@@ -99,11 +157,30 @@ class EnsemblePipeline:
         """
         start_time = time.time()
 
-        # Run all models concurrently
-        individual_results = await self._run_all_models(image_path)
+        # Content-addressed cache: re-uploads of the same screenshot reuse
+        # the previous consensus instead of re-running every model
+        image_key = await asyncio.to_thread(self._hash_image, image_path)
+        cached = self._result_cache.get(image_key)
+        if cached is not None:
+            self._result_cache.move_to_end(image_key)
+            return cached
+
+        # Encode the image to base64 once; base64-consuming models reuse
+        # it instead of re-reading and re-encoding the file (GPT-4V is
+        # the exception: it derives its own 768px-short-side variant,
+        # cached per file version, because high-detail mode tiles at
+        # that size)
+        image_b64 = await asyncio.to_thread(
+            BaseVisionModel._encode_image_base64, image_path
+        )
+
+        # Run all models concurrently; results carry the model index so
+        # downstream consensus can index the frozen weight tuple
+        indexed_results = await self._run_all_models(image_path, image_b64)
+        individual_results = [result for _, result in indexed_results]
 
         # Calculate consensus
-        consensus_extraction = self._calculate_consensus(individual_results)
+        consensus_extraction = self._calculate_consensus(indexed_results)
 
         # Validate results
         validation_results = self._validate_consensus(consensus_extraction)
@@ -118,7 +195,7 @@ class EnsemblePipeline:
 
         processing_time = time.time() - start_time
 
-        return EnsembleResult(
+        result = EnsembleResult(
             final_extraction=consensus_extraction,
             individual_results=individual_results,
             consensus_scores=self._calculate_consensus_scores(individual_results),
@@ -129,71 +206,131 @@ class EnsemblePipeline:
             requires_manual_review=requires_manual_review
         )
 
-    async def _run_all_models(self, image_path: str) -> List[ExtractionResult]:
+        self._result_cache[image_key] = result
+        if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+
+        return result
+
+    @staticmethod
+    def _hash_image(image_path: str) -> str:
+        """Hash the image file contents for result-cache keying."""
+        digest = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    async def _run_all_models(
+        self, image_path: str, image_b64: Optional[str] = None
+    ) -> List[Tuple[int, ExtractionResult]]:
         """
         Run all available models concurrently.
 
         Args:
             image_path: Path to the image
+            image_b64: Pre-encoded base64 JPEG shared across models
 
         Returns:
-            List of extraction results from all models
+            List of (model index, extraction result) pairs from all models
         """
-        tasks = []
-        for model in self.models:
-            task = asyncio.create_task(model.extract_mot_data(image_path))
-            tasks.append(task)
-
-        # Wait for all models to complete (with timeout)
-        try:
-            results = await asyncio.wait_for(
-                asyncio.gather(*tasks, return_exceptions=True),
-                timeout=settings.model_timeout
+        # Each model gets its own timeout so one straggler can't discard
+        # the results of models that already finished
+        tasks = [
+            asyncio.create_task(
+                asyncio.wait_for(
+                    self._run_model(idx, model, image_path, image_b64),
+                    model.config.timeout
+                )
             )
+            for idx, model in enumerate(self.models)
+        ]
 
-            # Filter out exceptions and return successful results
-            successful_results = []
-            for result in results:
-                if isinstance(result, ExtractionResult):
-                    successful_results.append(result)
-                else:
+        successful_results = []
+        try:
+            for future in asyncio.as_completed(tasks, timeout=settings.model_timeout):
+                try:
+                    successful_results.append(await future)
+                except asyncio.TimeoutError:
+                    ensemble_logger.warning("Model failed: timed out")
+                except Exception as e:
                     # Log the exception but continue with other models
-                    print(f"Model failed: {str(result)}")
-
-            return successful_results
-
+                    ensemble_logger.warning(f"Model failed: {str(e)}")
+                    continue
+
+                # Early exit: once enough models agree with high confidence
+                # on the critical fields, the remaining calls only add cost
+                if (len(successful_results) >= self.EARLY_EXIT_MIN_MODELS and
+                        self._has_unanimous_consensus(
+                            [result for _, result in successful_results])):
+                    for task in tasks:
+                        if not task.done():
+                            task.cancel()
+                    break
         except asyncio.TimeoutError:
-            raise RuntimeError("Model processing timeout exceeded")
-
-    def _calculate_consensus(self, results: List[ExtractionResult]) -> ExtractionResult:
+            # Outer budget exhausted: cancel stragglers, keep what finished
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        return successful_results
+
+    def _has_unanimous_consensus(self, results: List[ExtractionResult]) -> bool:
+        """Check whether all results agree on the critical fields with high confidence."""
+        for field in self.EARLY_EXIT_FIELDS:
+            values = {self._normalize_value(getattr(r, field)) for r in results}
+            if len(values) != 1 or "NOT_FOUND" in values:
+                return False
+            if any(r.confidence_scores.get(field, 0.0) < self.EARLY_EXIT_CONFIDENCE
+                   for r in results):
+                return False
+        return True
+
+    async def _run_model(
+        self, idx: int, model: BaseVisionModel, image_path: str,
+        image_b64: Optional[str] = None
+    ) -> Tuple[int, ExtractionResult]:
+        """Run one model's extraction under the appropriate concurrency cap."""
+        sem = self._gpu_sem if isinstance(model, FlorenceVisionModel) else self._api_sem
+        async with sem:
+            return idx, await model.extract_mot_data(image_path, image_b64=image_b64)
+
+    def _calculate_consensus(
+        self, indexed_results: List[Tuple[int, ExtractionResult]]
+    ) -> ExtractionResult:
         """
         Calculate consensus extraction from multiple model results.
 
         Args:
-            results: List of extraction results from different models
+            indexed_results: (model index, extraction result) pairs
 
         Returns:
             Consensus ExtractionResult
         """
-        if not results:
+        if not indexed_results:
             raise ValueError("No successful model results to process")
 
+        results = [result for _, result in indexed_results]
+
         # For each field, calculate weighted consensus
         consensus_data = {}
         consensus_confidence = {}
 
-        fields = ['registration', 'mot_expiry', 'make', 'model',
-                 'customer_name', 'customer_phone', 'customer_email']
+        # Resolve per-result lookups (confidence dict, indexed weight) once
+        # instead of once per field
+        rows = [
+            (result, result.confidence_scores, self._model_weight_by_idx[idx])
+            for idx, result in indexed_results
+        ]
 
-        for field in fields:
+        for field in CONSENSUS_FIELDS:
             field_values = []
             field_confidences = []
             field_weights = []
 
-            for result in results:
+            for result, confidences, model_weight in rows:
                 value = getattr(result, field)
-                confidence = result.confidence_scores.get(field, 0.0)
-                model_weight = self.model_weights.get(result.model_name, 0.1)
+                confidence = confidences.get(field, 0.0)
 
                 if value != "NOT_FOUND" and confidence > 0.3:
                     field_values.append(value)
@@ -232,7 +369,7 @@ class EnsemblePipeline:
         values: List[str],
         confidences: List[float],
         weights: List[float]
-    ) -> tuple[str, float]:
+    ) -> Tuple[str, float]:
         """
         Calculate weighted consensus for a field.
 
@@ -247,40 +384,35 @@ class EnsemblePipeline:
         if not values:
             return "NOT_FOUND", 0.0
 
-        # Group identical values
-        value_groups = {}
-        for i, value in enumerate(values):
+        # Group identical values, accumulating the weighted sums directly
+        # instead of materializing per-group lists and re-summing them
+        value_groups: Dict[str, list] = {}
+        for value, confidence, weight in zip(values, confidences, weights):
             normalized_value = self._normalize_value(value)
-            if normalized_value not in value_groups:
-                value_groups[normalized_value] = {
-                    'original_values': [],
-                    'confidences': [],
-                    'weights': []
-                }
-            value_groups[normalized_value]['original_values'].append(value)
-            value_groups[normalized_value]['confidences'].append(confidences[i])
-            value_groups[normalized_value]['weights'].append(weights[i])
+            group = value_groups.get(normalized_value)
+            if group is None:
+                # [total weight, weighted confidence sum, member count, value tally]
+                value_groups[normalized_value] = group = [0.0, 0.0, 0, Counter()]
+            group[0] += weight
+            group[1] += confidence * weight
+            group[2] += 1
+            group[3][value] += 1
 
         # Calculate weighted scores for each group
         best_score = 0.0
         best_value = "NOT_FOUND"
 
-        for normalized_value, group in value_groups.items():
-            # Calculate weighted score
-            total_weight = sum(group['weights'])
-            weighted_confidence = sum(
-                conf * weight for conf, weight in zip(group['confidences'], group['weights'])
-            ) / total_weight if total_weight > 0 else 0.0
+        for total_weight, weighted_sum, count, value_tally in value_groups.values():
+            weighted_confidence = weighted_sum / total_weight if total_weight > 0 else 0.0
 
             # Bonus for multiple model agreement
-            agreement_bonus = min(len(group['original_values']) * 0.1, 0.3)
+            agreement_bonus = min(count * 0.1, 0.3)
             final_score = weighted_confidence + agreement_bonus
 
             if final_score > best_score:
                 best_score = final_score
                 # Choose the most common original value in this group
-                best_value = max(set(group['original_values']),
-                               key=group['original_values'].count)
+                best_value = value_tally.most_common(1)[0][0]
 
         return best_value, min(best_score, 1.0)
 
@@ -288,13 +420,13 @@ class EnsemblePipeline:
         """Normalize value for comparison (remove spaces, case, etc.)."""
         if not value or value == "NOT_FOUND":
             return value
-        return re.sub(r'\s+', '', value.upper())
+        return _WHITESPACE_RE.sub('', value.upper())
 
     def _consensus_software(self, results: List[ExtractionResult]) -> str:
         """Determine consensus software detection."""
         software_detections = [r.software_detected for r in results if r.software_detected != "UNKNOWN"]
         if software_detections:
-            return max(set(software_detections), key=software_detections.count)
+            return Counter(software_detections).most_common(1)[0][0]
         return "UNKNOWN"
 
     def _calculate_consensus_scores(self, results: List[ExtractionResult]) -> Dict[str, float]:
@@ -302,12 +434,13 @@ class EnsemblePipeline:
         if not results:
             return {}
 
-        fields = ['registration', 'mot_expiry', 'make', 'model',
-                 'customer_name', 'customer_phone', 'customer_email']
-
-        consensus_scores = {}
-        for field in fields:
-            scores = [r.confidence_scores.get(field, 0.0) for r in results]
-            consensus_scores[field] = mean(scores) if scores else 0.0
+        # Accumulate per-field sums in one pass over the results instead of
+        # building a throwaway list per field for statistics.mean
+        sums = dict.fromkeys(CONSENSUS_FIELDS, 0.0)
+        for result in results:
+            confidences = result.confidence_scores
+            for field in CONSENSUS_FIELDS:
+                sums[field] += confidences.get(field, 0.0)
 
-        return consensus_scores
+        count = len(results)
+        return {field: total / count for field, total in sums.items()}
@@ -1,33 +1,39 @@
 """
 File handling utilities for the MOT OCR system.
 """
+import asyncio
 import os
 import uuid
 import aiofiles
+import aiofiles.os
 from pathlib import Path
 from typing import Optional
+import orjson
 from fastapi import UploadFile
-import magic
 from PIL import Image
 import logging
 
-from config.settings import settings
+from config.settings import settings, UPLOAD_PATH, RESULTS_PATH, ALLOWED_EXTENSIONS_SET
 
 logger = logging.getLogger(__name__)
 
 
 class FileHandler:
     """Handle file operations for the MOT OCR system."""
-    
+
+    # Chunk size for streaming uploads to disk; keeps memory flat and lets
+    # disk writes overlap with the rest of the request on the event loop
+    UPLOAD_CHUNK_SIZE = 64 * 1024
+
+    # Image formats (as reported by PIL) accepted for upload
+    VALID_IMAGE_FORMATS = frozenset({'JPEG', 'PNG', 'BMP', 'TIFF', 'WEBP', 'GIF'})
+
     def __init__(self):
-        self.upload_dir = Path(settings.upload_dir)
-        self.results_dir = Path(settings.results_dir)
+        # Directories are resolved and created once in config.settings
+        self.upload_dir = UPLOAD_PATH
+        self.results_dir = RESULTS_PATH
         self.max_file_size = settings.max_file_size
-        self.allowed_extensions = settings.allowed_extensions
-        
-        # Create directories if they don't exist
-        self.upload_dir.mkdir(parents=True, exist_ok=True)
-        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.allowed_extensions = ALLOWED_EXTENSIONS_SET
     
     def is_valid_image_file(self, filename: str) -> bool:
         """
@@ -68,18 +74,27 @@ class FileHandler:
         file_path = self.upload_dir / unique_filename
         
         try:
-            # Save file
+            # Stream file to disk in chunks instead of buffering it whole,
+            # enforcing the size limit as bytes arrive so oversized uploads
+            # are rejected early instead of after a full write
+            bytes_written = 0
             async with aiofiles.open(file_path, 'wb') as f:
-                content = await upload_file.read()
-                await f.write(content)
+                while chunk := await upload_file.read(self.UPLOAD_CHUNK_SIZE):
+                    bytes_written += len(chunk)
+                    if bytes_written > self.max_file_size:
+                        raise ValueError(
+                            f"File exceeds maximum size of {self.max_file_size} bytes"
+                        )
+                    await f.write(chunk)
             
-            # Validate file type by content
-            if not self._validate_image_content(file_path):
+            # Validate file type by content; PIL/magic are blocking, so run
+            # them on a worker thread to keep the event loop responsive
+            if not await asyncio.to_thread(self._validate_image_content, file_path):
                 await self.cleanup_file(str(file_path))
                 raise ValueError("Invalid image file content")
-            
+
             # Validate and potentially resize image
-            await self._process_image(file_path)
+            await asyncio.to_thread(self._process_image, file_path)
             
             logger.info(f"Saved upload file: {file_path}")
             return str(file_path)
@@ -92,53 +107,54 @@ class FileHandler:
     
     def _validate_image_content(self, file_path: Path) -> bool:
         """
-        Validate image file content using python-magic.
-        
+        Validate image file content. Blocking; run via to_thread.
+
         Args:
             file_path: Path to the file
-            
+
         Returns:
             True if valid image, False otherwise
         """
         try:
-            # Check MIME type
-            mime_type = magic.from_file(str(file_path), mime=True)
-            valid_mime_types = [
-                'image/jpeg', 'image/png', 'image/bmp', 
-                'image/tiff', 'image/webp', 'image/gif'
-            ]
-            
-            if mime_type not in valid_mime_types:
-                logger.warning(f"Invalid MIME type: {mime_type}")
-                return False
-            
-            # Try to open with PIL
+            # PIL already sniffs the file signature when opening, so one
+            # open + format check + verify covers what the separate
+            # libmagic MIME probe used to do in a second read of the file
             with Image.open(file_path) as img:
+                if img.format not in self.VALID_IMAGE_FORMATS:
+                    logger.warning(f"Invalid image format: {img.format}")
+                    return False
                 img.verify()
-            
+
             return True
-            
+
         except Exception as e:
             logger.warning(f"Image validation failed: {str(e)}")
             return False
     
-    async def _process_image(self, file_path: Path):
+    def _process_image(self, file_path: Path):
         """
-        Process and potentially resize image.
-        
+        Process and potentially resize image. Blocking; run via to_thread.
+
         Args:
             file_path: Path to the image file
         """
         try:
             with Image.open(file_path) as img:
+                max_width = settings.image_max_width
+                max_height = settings.image_max_height
+
+                # For oversized JPEGs, draft mode lets libjpeg decode at a
+                # reduced scale directly, so the full-resolution image is
+                # never materialized before downscaling
+                if (img.format == 'JPEG' and
+                        (img.size[0] > max_width or img.size[1] > max_height)):
+                    img.draft('RGB', (max_width, max_height))
+
                 # Convert to RGB if necessary
                 if img.mode not in ['RGB', 'L']:
                     img = img.convert('RGB')
-                
+
                 # Check if resizing is needed
-                max_width = settings.image_max_width
-                max_height = settings.image_max_height
-                
                 if img.size[0] > max_width or img.size[1] > max_height:
                     # Calculate new size maintaining aspect ratio
                     img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
@@ -161,7 +177,7 @@ class FileHandler:
         try:
             path = Path(file_path)
             if path.exists():
-                path.unlink()
+                await aiofiles.os.remove(file_path)
                 logger.debug(f"Cleaned up file: {file_path}")
         except Exception as e:
             logger.warning(f"Failed to cleanup file {file_path}: {str(e)}")
@@ -177,14 +193,15 @@ class FileHandler:
         Returns:
             Path to saved result file
         """
-        import json
-        
         result_filename = f"{request_id}_result.json"
         result_path = self.results_dir / result_filename
-        
+
         try:
-            async with aiofiles.open(result_path, 'w') as f:
-                await f.write(json.dumps(result_data, indent=2, default=str))
+            # orjson serializes straight to bytes, so write the file in
+            # binary mode and skip the str encode round-trip
+            payload = orjson.dumps(result_data, default=str, option=orjson.OPT_INDENT_2)
+            async with aiofiles.open(result_path, 'wb') as f:
+                await f.write(payload)
             
             logger.info(f"Saved result file: {result_path}")
             return str(result_path)
@@ -245,24 +262,29 @@ class FileHandler:
             max_age_hours: Maximum age of files to keep in hours
         """
         import time
-        
-        current_time = time.time()
-        max_age_seconds = max_age_hours * 3600
-        
-        directories = [self.upload_dir, self.results_dir]
-        
-        for directory in directories:
+
+        cutoff = time.time() - max_age_hours * 3600
+
+        for directory in (self.upload_dir, self.results_dir):
             try:
-                for file_path in directory.iterdir():
-                    if file_path.is_file():
-                        file_age = current_time - file_path.stat().st_mtime
-                        
-                        if file_age > max_age_seconds:
-                            file_path.unlink()
-                            logger.debug(f"Cleaned up old file: {file_path}")
-                            
+                # The scan/stat/unlink batch is synchronous filesystem work,
+                # so run each directory sweep on a worker thread
+                await asyncio.to_thread(self._cleanup_directory, directory, cutoff)
             except Exception as e:
                 logger.warning(f"Failed to cleanup directory {directory}: {str(e)}")
+
+    @staticmethod
+    def _cleanup_directory(directory: Path, cutoff: float):
+        """Delete files in a directory older than cutoff. Blocking; run via to_thread."""
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if (entry.is_file(follow_symlinks=False) and
+                        entry.stat(follow_symlinks=False).st_mtime < cutoff):
+                    try:
+                        os.unlink(entry.path)
+                        logger.debug(f"Cleaned up old file: {entry.path}")
+                    except OSError as e:
+                        logger.warning(f"Failed to remove {entry.path}: {str(e)}")
     
     def get_storage_stats(self) -> dict:
         """
@@ -275,15 +297,23 @@ class FileHandler:
             """Get directory size and file count."""
             total_size = 0
             file_count = 0
-            
-            try:
-                for file_path in directory.rglob('*'):
-                    if file_path.is_file():
-                        total_size += file_path.stat().st_size
-                        file_count += 1
-            except Exception:
-                pass
-            
+
+            # os.scandir surfaces type and stat info from the directory
+            # read itself, avoiding the extra stat() per entry that
+            # rglob + Path.stat would issue
+            stack = [str(directory)]
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_file(follow_symlinks=False):
+                                total_size += entry.stat(follow_symlinks=False).st_size
+                                file_count += 1
+                            elif entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                except OSError:
+                    continue
+
             return total_size, file_count
         
         upload_size, upload_files = get_dir_size(self.upload_dir)
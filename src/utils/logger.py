@@ -9,10 +9,18 @@ from typing import Optional
 
 from config.settings import settings
 
+# Resolved once: the frame walk in InterceptHandler.emit compares every
+# frame's filename against this, so keep it a module constant
+_LOGGING_FILE = logging.__file__
+
+# Bound on the caller-frame search; anything deeper is pathological and
+# loguru's default attribution is good enough
+_MAX_FRAME_DEPTH = 10
+
 
 class InterceptHandler(logging.Handler):
     """Intercept standard logging and redirect to loguru."""
-    
+
     def emit(self, record):
         # Get corresponding Loguru level if it exists
         try:
@@ -20,9 +28,13 @@ class InterceptHandler(logging.Handler):
         except ValueError:
             level = record.levelno
 
-        # Find caller from where originated the logged message
+        # Find caller from where originated the logged message; the walk
+        # is bounded so a deep logging stack can't turn every record into
+        # a long frame traversal
         frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
+        while (frame is not None and
+               frame.f_code.co_filename == _LOGGING_FILE and
+               depth < _MAX_FRAME_DEPTH):
             frame = frame.f_back
             depth += 1
 
@@ -60,8 +72,10 @@ def setup_logger(name: Optional[str] = None) -> logging.Logger:
         backtrace=True,
         diagnose=True
     )
-    
-    # File handler with rotation
+
+    # File handler with rotation; enqueue moves the disk write and the
+    # zip compression on rotation onto a background thread so the
+    # request path never blocks on log I/O
     logger.add(
         settings.log_file,
         level=settings.log_level,
@@ -70,7 +84,9 @@ def setup_logger(name: Optional[str] = None) -> logging.Logger:
         retention=settings.log_retention,
         compression="zip",
         backtrace=True,
-        diagnose=True
+        diagnose=True,
+        enqueue=True,
+        catch=True
     )
     
     # Intercept standard logging
@@ -3,11 +3,48 @@ MOT date validation and parsing.
 """
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, List, Tuple
 from dataclasses import dataclass
 
+# Cleaning patterns, compiled once at import so the per-call path never
+# re-parses regex source strings
+_WHITESPACE_RE = re.compile(r'\s+')
+# IGNORECASE: affixes are stripped before the OCR translation pass, so
+# this sees the original casing ("Expires:", "mot"); stripping first
+# keeps the translation from mangling the affix words (MOT -> M0T) into
+# something the pattern no longer recognizes
+_AFFIX_RE = re.compile(
+    r'^(?:MOT|EXPIRES?|DUE|UNTIL)(?::\s*|\s+)|\s*(?:MOT|EXPIRY|DUE)$',
+    re.IGNORECASE
+)
+_TWO_DIGIT_YEAR_RE = re.compile(r'[0-9]{2}/[0-9]{2}/[0-9]{2}$')
 
-@dataclass
+# Reasonableness bounds: MOT testing began in 1960, and the rolling
+# two-year window is a shared constant so the per-call path compares
+# against it instead of constructing fresh timedelta objects
+_MOT_MIN_YEAR = 1960
+_TWO_YEARS = timedelta(days=365 * 2)
+
+# Numeric day-first formats whose captured groups can be fed straight to
+# the datetime constructor, bypassing strptime's format-string parsing
+_DMY_FORMATS = frozenset(('%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y'))
+
+# Base confidence per pattern: DD/MM/YYYY is the dominant UK format, the
+# other numeric day-first separators are close behind, ISO order is less
+# common, month-name formats take the default of 0.8
+_PATTERN_BASE_CONFIDENCE = {
+    'DD/MM/YYYY': 1.0,
+    'DD-MM-YYYY': 0.9,
+    'DD.MM.YYYY': 0.9,
+    'YYYY-MM-DD': 0.7,
+}
+
+
+# Allocated once per validated date: slots=True drops the per-instance
+# __dict__ and frozen=True lets the batch-dedup path hand the same
+# instance to many callers safely
+@dataclass(slots=True, frozen=True)
 class DateValidationResult:
     """Result of date validation."""
     is_valid: bool
@@ -45,43 +82,83 @@ class DateValidator:
             'description': 'YYYY-MM-DD'
         },
         {
-            'pattern': r'(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})',
+            'pattern': r'(\d{1,2})\s+(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s+(\d{4})',
             'format': '%d %b %Y',
             'description': 'DD Mon YYYY'
         },
         {
-            'pattern': r'(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})',
+            'pattern': r'(\d{1,2})\s+(JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER)\s+(\d{4})',
             'format': '%d %B %Y',
             'description': 'DD Month YYYY'
         }
     ]
     
+    # Compiled (regex, format, description, base confidence) rows derived
+    # from DATE_PATTERNS; the parse loop iterates these instead of
+    # compiling patterns or re-deriving scores per call
+    COMPILED_DATE_PATTERNS = [
+        (re.compile(p['pattern']), p['format'], p['description'],
+         _PATTERN_BASE_CONFIDENCE.get(p['description'], 0.8))
+        for p in DATE_PATTERNS
+    ]
+
     # Common OCR misreadings
     OCR_CORRECTIONS = {
         'O': '0', 'o': '0', 'I': '1', 'l': '1', 'S': '5', 's': '5',
         'G': '6', 'B': '8', 'Z': '2', 'z': '2'
     }
+
+    # Translation table applying every OCR correction in one C-level pass
+    # instead of one str.replace scan per character pair
+    OCR_TRANSLATION = str.maketrans(OCR_CORRECTIONS)
+
+    # Index of the pattern that matched most recently, promoted to the
+    # front of the parse loop (single-element list so the classmethod
+    # core can update it without a class attribute rebind)
+    _LAST_HIT = [0]
     
     def validate_date(self, date_string: str) -> DateValidationResult:
         """
         Validate and parse a MOT expiry date.
-        
+
         Args:
             date_string: The date string to validate
-            
+
         Returns:
             DateValidationResult with validation details
         """
+        return self._validate_date(date_string, datetime.now())
+
+    def validate_dates(self, date_strings: List[str]) -> List[DateValidationResult]:
+        """
+        Validate a batch of MOT expiry dates against one shared timestamp.
+
+        Args:
+            date_strings: Date strings to validate
+
+        Returns:
+            List of DateValidationResults in input order
+        """
+        now = datetime.now()
+
+        # Deduplicate within the batch: repeated strings (same vehicle
+        # re-extracted, recurring OCR output) are validated once and the
+        # shared result reused, on top of the module-level parse cache
+        seen: dict = {}
+        results = []
+        for date_string in date_strings:
+            result = seen.get(date_string)
+            if result is None:
+                result = seen[date_string] = self._validate_date(date_string, now)
+            results.append(result)
+        return results
+
+    def _validate_date(self, date_string: str, now: datetime) -> DateValidationResult:
+        """Validation core sharing a caller-supplied reference time."""
         if not date_string or date_string.strip() == "NOT_FOUND":
-            return DateValidationResult(
-                is_valid=False,
-                parsed_date=None,
-                normalized_date="",
-                confidence_score=0.0,
-                validation_errors=["Date is empty or not found"],
-                is_expired=False,
-                days_until_expiry=None
-            )
+            # Missing fields are the most common input by far; reuse one
+            # shared result instead of allocating a fresh dataclass
+            return _EMPTY_DATE_RESULT
         
         # Clean and normalize the date string
         cleaned_date = self._clean_date_string(date_string)
@@ -103,10 +180,10 @@ class DateValidator:
             )
         
         # Validate date reasonableness
-        confidence = self._validate_date_reasonableness(parsed_date, confidence, validation_errors)
-        
+        confidence = self._validate_date_reasonableness(parsed_date, confidence, validation_errors, now)
+
         # Calculate expiry status
-        is_expired, days_until_expiry = self._calculate_expiry_status(parsed_date)
+        is_expired, days_until_expiry = self._calculate_expiry_status(parsed_date, now)
         
         # Format normalized date
         normalized_date = parsed_date.strftime('%d/%m/%Y')
@@ -126,24 +203,30 @@ class DateValidator:
     def _clean_date_string(self, date_string: str) -> str:
         """
         Clean and normalize date string for parsing.
-        
+
         Args:
             date_string: Raw date string
-            
+
         Returns:
             Cleaned date string
         """
+        return _clean_date_string_cached(date_string)
+
+    @classmethod
+    def _clean_date_string_uncached(cls, date_string: str) -> str:
+        """Cleaning core behind the memoized entry point."""
         # Remove extra whitespace
-        cleaned = re.sub(r'\s+', ' ', date_string.strip())
-        
-        # Apply OCR corrections
-        for wrong, correct in self.OCR_CORRECTIONS.items():
-            cleaned = cleaned.replace(wrong, correct)
-        
-        # Remove common prefixes/suffixes
-        cleaned = re.sub(r'^(MOT|Expires?|Due|Until):\s*', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\s*(MOT|Expiry|Due)$', '', cleaned, flags=re.IGNORECASE)
-        
+        cleaned = _WHITESPACE_RE.sub(' ', date_string.strip())
+
+        # Remove common prefixes/suffixes in one pass, before the OCR
+        # corrections can rewrite their letters
+        cleaned = _AFFIX_RE.sub('', cleaned)
+
+        # Apply OCR corrections (before uppercasing: the table keys
+        # include the lowercase look-alikes), then uppercase once so the
+        # downstream patterns can stay case-sensitive
+        cleaned = cleaned.translate(cls.OCR_TRANSLATION).upper()
+
         return cleaned.strip()
     
     def _parse_date(self, date_string: str) -> Tuple[Optional[datetime], Optional[str], float]:
@@ -156,109 +239,137 @@ class DateValidator:
         Returns:
             Tuple of (parsed_date, pattern_used, confidence_score)
         """
-        for pattern_info in self.DATE_PATTERNS:
+        return _parse_date_cached(date_string)
+
+    @classmethod
+    def _parse_date_uncached(cls, date_string: str) -> Tuple[Optional[datetime], Optional[str], float]:
+        """Pattern-matching core behind the memoized parse."""
+        # Fast path: cleaning usually reduces the input to a bare date
+        # token, so anchored matching rejects non-matching patterns
+        # immediately. Inputs that keep an unrecognized prefix fall back
+        # to a scanning pass, preserving the historical search behaviour.
+        result = cls._match_patterns(date_string, anchored=True)
+        if result[0] is None:
+            result = cls._match_patterns(date_string, anchored=False)
+        return result
+
+    @classmethod
+    def _match_patterns(
+        cls, date_string: str, anchored: bool
+    ) -> Tuple[Optional[datetime], Optional[str], float]:
+        """Run the pattern loop, anchored at the start or scanning."""
+        patterns = cls.COMPILED_DATE_PATTERNS
+        # Try the most recently successful pattern first: a document's
+        # dates almost always share one format, so after the first hit
+        # the rest of the batch matches on the first attempt. The
+        # patterns are mutually exclusive, so reordering cannot change
+        # which one matches.
+        last = cls._LAST_HIT[0]
+        for index in (last, *(i for i in range(len(patterns)) if i != last)):
+            regex, date_format, description, base_confidence = patterns[index]
+            match = regex.match(date_string) if anchored else regex.search(date_string)
+            if not match:
+                continue
+
             try:
-                match = re.search(pattern_info['pattern'], date_string, re.IGNORECASE)
-                if match:
-                    # Try to parse the date
-                    if pattern_info['format'] in ['%d %b %Y', '%d %B %Y']:
-                        # Handle month name patterns
-                        parsed_date = datetime.strptime(match.group(0), pattern_info['format'])
-                    else:
-                        # Handle numeric patterns
-                        parsed_date = datetime.strptime(match.group(0), pattern_info['format'])
-                    
-                    # Calculate confidence based on pattern quality
-                    confidence = self._calculate_pattern_confidence(pattern_info, match.group(0))
-                    
-                    return parsed_date, pattern_info['description'], confidence
-                    
+                # The regex has already captured the digit groups for the
+                # numeric formats, so build the datetime directly and only
+                # fall back to strptime for month-name formats
+                if date_format in _DMY_FORMATS:
+                    parsed_date = datetime(
+                        int(match.group(3)), int(match.group(2)), int(match.group(1))
+                    )
+                elif date_format == '%Y-%m-%d':
+                    parsed_date = datetime(
+                        int(match.group(1)), int(match.group(2)), int(match.group(3))
+                    )
+                else:
+                    parsed_date = datetime.strptime(match.group(0), date_format)
             except ValueError:
                 # Invalid date (e.g., 32/13/2024)
                 continue
-        
+
+            # Calculate confidence based on pattern quality
+            confidence = cls._calculate_pattern_confidence(base_confidence, match.group(0))
+
+            cls._LAST_HIT[0] = index
+            return parsed_date, description, confidence
+
         return None, None, 0.0
     
-    def _calculate_pattern_confidence(self, pattern_info: dict, matched_string: str) -> float:
+    @staticmethod
+    def _calculate_pattern_confidence(base_confidence: float, matched_string: str) -> float:
         """
         Calculate confidence score based on pattern type and quality.
-        
+
         Args:
-            pattern_info: Pattern information dictionary
+            base_confidence: Precomputed base confidence for the pattern
             matched_string: The matched date string
-            
+
         Returns:
             Confidence score (0.0-1.0)
         """
-        base_confidence = 0.8
-        
-        # Prefer DD/MM/YYYY format (most common in UK)
-        if pattern_info['description'] == 'DD/MM/YYYY':
-            base_confidence = 1.0
-        elif pattern_info['description'] in ['DD-MM-YYYY', 'DD.MM.YYYY']:
-            base_confidence = 0.9
-        elif pattern_info['description'] == 'YYYY-MM-DD':
-            base_confidence = 0.7  # Less common in UK
-        
         # Check for suspicious patterns
-        if re.search(r'[0-9]{2}/[0-9]{2}/[0-9]{2}$', matched_string):
+        if _TWO_DIGIT_YEAR_RE.search(matched_string):
             base_confidence -= 0.2  # Two-digit year is suspicious
-        
+
         return base_confidence
     
     def _validate_date_reasonableness(
-        self, 
-        parsed_date: datetime, 
-        base_confidence: float, 
-        validation_errors: List[str]
+        self,
+        parsed_date: datetime,
+        base_confidence: float,
+        validation_errors: List[str],
+        now: datetime
     ) -> float:
         """
         Validate that the date is reasonable for MOT expiry.
-        
+
         Args:
             parsed_date: Parsed datetime object
             base_confidence: Base confidence score
             validation_errors: List to append validation errors to
-            
+            now: Reference time, captured once per validation
+
         Returns:
             Adjusted confidence score
         """
-        now = datetime.now()
         confidence = base_confidence
-        
+        year = parsed_date.year
+
         # Check if date is too far in the past
-        if parsed_date < now - timedelta(days=365 * 2):  # More than 2 years ago
+        if parsed_date < now - _TWO_YEARS:  # More than 2 years ago
             validation_errors.append("Date is more than 2 years in the past")
             confidence -= 0.3
-        
+
         # Check if date is too far in the future
-        if parsed_date > now + timedelta(days=365 * 2):  # More than 2 years in future
+        if parsed_date > now + _TWO_YEARS:  # More than 2 years in future
             validation_errors.append("Date is more than 2 years in the future")
             confidence -= 0.4
-        
-        # Check for impossible dates
-        if parsed_date.year < 1960:  # MOT testing started in 1960
+
+        # Impossible-date checks are plain integer comparisons on the
+        # year strptime already produced
+        if year < _MOT_MIN_YEAR:  # MOT testing started in 1960
             validation_errors.append("Date is before MOT testing began")
             confidence -= 0.5
-        
-        if parsed_date.year > now.year + 5:  # More than 5 years in future
+
+        if year > now.year + 5:  # More than 5 years in future
             validation_errors.append("Date is unreasonably far in the future")
             confidence -= 0.5
-        
+
         return max(0.0, confidence)
     
-    def _calculate_expiry_status(self, parsed_date: datetime) -> Tuple[bool, Optional[int]]:
+    def _calculate_expiry_status(self, parsed_date: datetime, now: datetime) -> Tuple[bool, Optional[int]]:
         """
         Calculate whether the MOT has expired and days until expiry.
-        
+
         Args:
             parsed_date: Parsed MOT expiry date
-            
+            now: Reference time, captured once per validation
+
         Returns:
             Tuple of (is_expired, days_until_expiry)
         """
-        now = datetime.now()
-        
         # Calculate days difference
         days_diff = (parsed_date - now).days
         
@@ -304,5 +415,35 @@ class DateValidator:
                     info['status'] = f"Expires in {validation_result.days_until_expiry} days (SOON)"
                 else:
                     info['status'] = f"Expires in {validation_result.days_until_expiry} days"
-        
+
         return info
+
+
+# Memoized cleaning keyed on the raw input. OCR output repeats the same
+# strings across frames, so a repeat skips the whitespace/translate/affix
+# passes entirely.
+@lru_cache(maxsize=4096)
+def _clean_date_string_cached(date_string: str) -> str:
+    return DateValidator._clean_date_string_uncached(date_string)
+
+
+# Memoized parse keyed on the cleaned date string. Parsing is a pure
+# function of its input and OCR batches repeat the same strings often, so
+# repeats collapse into a dict lookup. Reasonableness and expiry checks
+# stay outside the cache because they depend on the current time.
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_string: str) -> Tuple[Optional[datetime], Optional[str], float]:
+    return DateValidator._parse_date_uncached(date_string)
+
+
+# Shared result for the empty/NOT_FOUND fast path; errors are a tuple so
+# the singleton cannot be mutated by callers
+_EMPTY_DATE_RESULT = DateValidationResult(
+    is_valid=False,
+    parsed_date=None,
+    normalized_date="",
+    confidence_score=0.0,
+    validation_errors=("Date is empty or not found",),
+    is_expired=False,
+    days_until_expiry=None
+)
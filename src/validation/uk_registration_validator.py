@@ -2,12 +2,17 @@
 UK vehicle registration number validation.
 """
 import re
+import time
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass
+# Allocated once per validated plate: slots=True drops the per-instance
+# __dict__ and frozen=True lets the memo and batch-dedup paths hand the
+# same instance to many callers safely
+@dataclass(slots=True, frozen=True)
 class RegistrationValidationResult:
     """Result of registration validation."""
     is_valid: bool
@@ -51,58 +56,146 @@ class UKRegistrationValidator:
         }
     }
     
-    # DVLA area codes for validation
-    DVLA_AREA_CODES = {
-        'A': ['Peterborough'], 'B': ['Birmingham'], 'C': ['Cymru (Wales)'],
-        'D': ['Deeside'], 'E': ['Dudley'], 'F': ['Forest & Fens'],
-        'G': ['Garden of England'], 'H': ['Hampshire & Dorset'],
-        'K': ['Luton'], 'L': ['London'], 'M': ['Manchester'],
-        'N': ['Newcastle'], 'O': ['Oxford'], 'P': ['Preston'],
-        'R': ['Reading'], 'S': ['Scotland'], 'V': ['Severn Valley'],
-        'W': ['West of England'], 'Y': ['Yorkshire']
-    }
-    
-    # Age identifiers for current format (2001-present)
-    AGE_IDENTIFIERS = {
-        '01': 2001, '51': 2001, '02': 2002, '52': 2002,
-        '03': 2003, '53': 2003, '04': 2004, '54': 2004,
-        '05': 2005, '55': 2005, '06': 2006, '56': 2006,
-        '07': 2007, '57': 2007, '08': 2008, '58': 2008,
-        '09': 2009, '59': 2009, '10': 2010, '60': 2010,
-        '11': 2011, '61': 2011, '12': 2012, '62': 2012,
-        '13': 2013, '63': 2013, '14': 2014, '64': 2014,
-        '15': 2015, '65': 2015, '16': 2016, '66': 2016,
-        '17': 2017, '67': 2017, '18': 2018, '68': 2018,
-        '19': 2019, '69': 2019, '20': 2020, '70': 2020,
-        '21': 2021, '71': 2021, '22': 2022, '72': 2022,
-        '23': 2023, '73': 2023, '24': 2024, '74': 2024,
-    }
+    # All format patterns fused into one alternation with named groups.
+    # The scalar path now classifies via the category-template table
+    # below; this compiled union is kept for vectorized batch extraction,
+    # where a single regex pass over a string column is the right tool.
+    COMBINED_FORMAT_RE = re.compile(
+        '^(?:' + '|'.join(
+            f"(?P<{name}>{info['pattern'].lstrip('^').rstrip('$')})"
+            for name, info in REGISTRATION_PATTERNS.items()
+        ) + ')$'
+    )
+
+    # Suspicious character combinations that often indicate OCR errors,
+    # fused into one alternation so a single scan counts every offense:
+    # number-letter-number, alternating letter/digit runs, repeated
+    # ambiguous characters, repeated O/0 characters
+    SUSPICIOUS_RE = re.compile(
+        r'[0-9][A-Z][0-9]|[A-Z][0-9][A-Z][0-9][A-Z]|[IL1|][IL1|]|[O0][O0]'
+    )
+
+    # First letters of DVLA memory-tag area codes; only membership is
+    # ever checked, so a frozenset replaces the old dict of region names
+    VALID_AREA_CODE_LETTERS = frozenset('ABCDEFGHKLMNOPRSVWY')
     
+    # Age identifiers for the current format (2001-present) follow a
+    # fixed arithmetic rule: code n maps to year 2000 + (n % 50), with
+    # March plates using 01-24 and September plates 51-74. Derived
+    # directly instead of through a 48-entry lookup table.
+    AGE_CODE_MAX_YEAR_DIGITS = 24
+
+    # How long a cached reference year stays valid before re-reading the
+    # clock; an hour bounds staleness at year roll-over to that window
+    YEAR_REFRESH_SECONDS = 3600.0
+
+    def __init__(self):
+        self._year_cache = (datetime.now().year, time.monotonic())
+
+    def _current_year(self) -> int:
+        """Reference year, re-read from the clock at most hourly.
+
+        datetime.now() is a syscall per call; at batch OCR rates the
+        cached int with a cheap monotonic staleness check is enough,
+        since the answer only changes once a year.
+        """
+        year, fetched_at = self._year_cache
+        if time.monotonic() - fetched_at > self.YEAR_REFRESH_SECONDS:
+            year = datetime.now().year
+            self._year_cache = (year, time.monotonic())
+        return year
+
     def validate_registration(self, registration: str) -> RegistrationValidationResult:
         """
         Validate a UK vehicle registration number.
-        
+
         Args:
             registration: The registration number to validate
-            
+
         Returns:
             RegistrationValidationResult with validation details
         """
+        return self._validate(registration, self._current_year())
+
+    def validate_batch(self, registrations: List[str]) -> List[RegistrationValidationResult]:
+        """
+        Validate a batch of registrations against one shared reference year.
+
+        Args:
+            registrations: Registration numbers to validate
+
+        Returns:
+            List of RegistrationValidationResults in input order
+        """
+        current_year = self._current_year()
+
+        # Deduplicate within the batch: recurring plates are validated
+        # once and the shared result reused
+        seen: dict = {}
+        results = []
+        for registration in registrations:
+            result = seen.get(registration)
+            if result is None:
+                result = seen[registration] = self._validate(registration, current_year)
+            results.append(result)
+        return results
+
+    def validate_many(self, registrations: List[str]):
+        """
+        Normalize and classify a column of registrations in one pass.
+
+        Suited to bulk OCR sweeps emitting thousands of candidates:
+        pandas' C string kernels normalize the whole column and a single
+        vectorized scan of the combined format regex classifies every
+        row, instead of per-element Python dispatch. Full per-plate
+        scoring (area codes, age identifiers, confidence) stays on
+        validate_batch, which this complements rather than replaces.
+
+        Args:
+            registrations: Registration numbers to classify
+
+        Returns:
+            DataFrame with columns 'registration', 'normalized',
+            'format_type' and 'matches_format', in input order
+        """
+        # Declared project dependency, imported lazily so the scalar
+        # path never pays for it
+        import pandas as pd
+
+        series = pd.Series(registrations, dtype="object")
+        normalized = series.str.upper().str.translate(_NORMALIZE_TABLE)
+
+        # Each named group of the union regex becomes a column; the
+        # non-null one names the format that matched
+        groups = normalized.str.extract(self.COMBINED_FORMAT_RE)
+        matched = groups.notna()
+        any_match = matched.any(axis=1)
+
+        return pd.DataFrame({
+            'registration': series,
+            'normalized': normalized,
+            'format_type': matched.idxmax(axis=1).where(any_match, 'unknown'),
+            'matches_format': any_match,
+        })
+
+    def _validate(self, registration: str, current_year: int) -> RegistrationValidationResult:
+        """Validation core sharing a caller-supplied reference year."""
+        return _validate_cached(registration, current_year)
+
+    @classmethod
+    def _validate_uncached(cls, registration: str, current_year: int) -> RegistrationValidationResult:
+        """Full validation behind the memoized entry point."""
         if not registration or registration.strip() == "NOT_FOUND":
-            return RegistrationValidationResult(
-                is_valid=False,
-                format_type="unknown",
-                confidence_score=0.0,
-                normalized_registration="",
-                validation_errors=["Registration is empty or not found"]
-            )
+            # Missing fields are the most common input by far; reuse one
+            # shared result instead of allocating a fresh dataclass
+            return _EMPTY_REGISTRATION_RESULT
         
         # Normalize the registration
-        normalized_reg = self._normalize_registration(registration)
+        normalized_reg = _normalize_registration_cached(registration)
         validation_errors = []
-        
+
         # Check against all patterns
-        format_type, pattern_match = self._identify_format(normalized_reg)
+        format_type, pattern_match = _identify_format_cached(normalized_reg)
         
         if not pattern_match:
             validation_errors.append("Does not match any known UK registration format")
@@ -125,26 +218,27 @@ class UKRegistrationValidator:
             age_code = normalized_reg[2:4]
             
             # Check area code
-            if area_code[0] not in self.DVLA_AREA_CODES:
+            if area_code[0] not in cls.VALID_AREA_CODE_LETTERS:
                 validation_errors.append(f"Invalid area code: {area_code[0]}")
                 confidence_score -= 0.2
             
             # Check age identifier
-            if age_code in self.AGE_IDENTIFIERS:
+            code = int(age_code)
+            if (1 <= code <= cls.AGE_CODE_MAX_YEAR_DIGITS or
+                    51 <= code <= 50 + cls.AGE_CODE_MAX_YEAR_DIGITS):
                 age_identifier = age_code
-                estimated_year = self.AGE_IDENTIFIERS[age_code]
+                estimated_year = 2000 + (code % 50)
             else:
                 validation_errors.append(f"Invalid age identifier: {age_code}")
                 confidence_score -= 0.3
             
             # Check for future dates
-            current_year = datetime.now().year
             if estimated_year and estimated_year > current_year + 1:
                 validation_errors.append(f"Registration appears to be from future year: {estimated_year}")
                 confidence_score -= 0.4
         
         # Check for common OCR errors
-        confidence_score = self._adjust_for_ocr_errors(normalized_reg, confidence_score)
+        confidence_score = cls._adjust_for_ocr_errors(normalized_reg, confidence_score)
         
         is_valid = len(validation_errors) == 0 and confidence_score >= 0.5
         
@@ -168,13 +262,7 @@ class UKRegistrationValidator:
         Returns:
             Normalized registration string
         """
-        # Remove spaces, convert to uppercase
-        normalized = re.sub(r'\s+', '', registration.upper())
-        
-        # Remove common OCR artifacts
-        normalized = normalized.replace('O', '0').replace('I', '1').replace('S', '5')
-        
-        return normalized
+        return _normalize_registration_cached(registration)
     
     def _identify_format(self, registration: str) -> Tuple[str, bool]:
         """
@@ -186,37 +274,22 @@ class UKRegistrationValidator:
         Returns:
             Tuple of (format_type, is_match)
         """
-        for format_type, pattern_info in self.REGISTRATION_PATTERNS.items():
-            if re.match(pattern_info['pattern'], registration):
-                return format_type, True
-        
-        return "unknown", False
+        return _identify_format_cached(registration)
     
-    def _adjust_for_ocr_errors(self, registration: str, base_confidence: float) -> float:
+    @classmethod
+    def _adjust_for_ocr_errors(cls, registration: str, base_confidence: float) -> float:
         """
         Adjust confidence score based on potential OCR errors.
-        
+
         Args:
             registration: Normalized registration
             base_confidence: Base confidence score
-            
+
         Returns:
             Adjusted confidence score
         """
-        # Check for suspicious character combinations that might be OCR errors
-        suspicious_patterns = [
-            r'[0-9][A-Z][0-9]',  # Number-letter-number (unusual)
-            r'[A-Z][0-9][A-Z][0-9][A-Z]',  # Alternating pattern
-            r'[IL1|][IL1|]',  # Multiple ambiguous characters
-            r'[O0][O0]',  # Multiple O/0 characters
-        ]
-        
-        confidence_adjustment = 0.0
-        for pattern in suspicious_patterns:
-            if re.search(pattern, registration):
-                confidence_adjustment -= 0.1
-        
-        return max(0.0, base_confidence + confidence_adjustment)
+        hits = len(cls.SUSPICIOUS_RE.findall(registration))
+        return max(0.0, base_confidence - 0.1 * hits)
     
     def get_registration_info(self, registration: str) -> Dict[str, any]:
         """
@@ -246,5 +319,90 @@ class UKRegistrationValidator:
         if validation_result.age_identifier:
             info['age_identifier'] = validation_result.age_identifier
             info['estimated_year'] = validation_result.estimated_year
-        
+
         return info
+
+
+# Character-category table and format templates. A normalized plate is
+# at most 8 ASCII characters, so classification reduces to translating
+# the bytes into letter/digit/other categories and looking the category
+# string up in a dict of the formats' fixed templates — a handful of
+# C-level table lookups and one hash, with no regex engine involved and
+# nothing to backtrack on invalid input.
+_CATEGORY_TABLE = bytes(
+    ord('L') if 65 <= i <= 90 else ord('D') if 48 <= i <= 57 else ord('X')
+    for i in range(256)
+)
+
+# Templates expanded from REGISTRATION_PATTERNS' variable-length digit
+# and letter runs; insertion order mirrors the alternation's priority
+# (setdefault keeps the first format claiming a template)
+_TEMPLATE_TO_FORMAT: Dict[bytes, str] = {b'LLDDLLL': 'current'}
+for _digits in range(1, 4):
+    _TEMPLATE_TO_FORMAT.setdefault(b'L' + b'D' * _digits + b'LLL', 'prefix')
+    _TEMPLATE_TO_FORMAT.setdefault(b'LLL' + b'D' * _digits + b'L', 'suffix')
+for _digits in range(1, 5):
+    for _letters in range(1, 4):
+        _TEMPLATE_TO_FORMAT.setdefault(
+            b'D' * _digits + b'L' * _letters, 'dateless')
+        _TEMPLATE_TO_FORMAT.setdefault(
+            b'L' * _letters + b'D' * _digits, 'northern_ireland')
+del _digits, _letters
+
+
+# Shared result for the empty/NOT_FOUND fast path; errors are a tuple so
+# the singleton cannot be mutated by callers
+_EMPTY_REGISTRATION_RESULT = RegistrationValidationResult(
+    is_valid=False,
+    format_type="unknown",
+    confidence_score=0.0,
+    normalized_registration="",
+    validation_errors=("Registration is empty or not found",)
+)
+
+
+# Single-pass normalization table: OCR look-alikes corrected and ASCII
+# whitespace deleted in one C-level translate over the uppercased input
+_NORMALIZE_TABLE = str.maketrans('OIS', '015', ' \t\n\r\x0b\x0c')
+
+
+# Memoized full validation keyed on (raw input, reference year). The
+# result is a pure function of both, and OCR streams repeat the same
+# plates heavily, so a repeat skips normalization, classification and
+# every format-specific check. Results are never mutated by callers
+# (the batch path already shares them), so handing out the cached
+# instance is safe. The year in the key means entries quietly expire
+# at year roll-over instead of serving stale future-year checks.
+@lru_cache(maxsize=4096)
+def _validate_cached(registration: str, current_year: int) -> RegistrationValidationResult:
+    return UKRegistrationValidator._validate_uncached(registration, current_year)
+
+
+# Memoized string helpers: both are pure functions of their input, and
+# batches of screenshots repeat the same plates often, so repeats become
+# a dict lookup instead of regex work
+@lru_cache(maxsize=4096)
+def _normalize_registration_cached(registration: str) -> str:
+    # Pre-normalized input (DVLA responses, prior-stage output) is
+    # usually uppercase already; isupper is a single C scan that skips
+    # the upper() allocation in that case. The translate pass always
+    # runs — whitespace stripping and OCR look-alike correction cannot
+    # be ruled out without an equivalent scan.
+    if not registration.isupper():
+        registration = registration.upper()
+    return registration.translate(_NORMALIZE_TABLE)
+
+
+@lru_cache(maxsize=4096)
+def _identify_format_cached(registration: str) -> Tuple[str, bool]:
+    # Translate the plate's bytes into their letter/digit categories and
+    # look the category string up in the template table; non-ASCII input
+    # cannot match any format, so it skips straight to unknown
+    if registration.isascii():
+        format_type = _TEMPLATE_TO_FORMAT.get(
+            registration.encode().translate(_CATEGORY_TABLE)
+        )
+        if format_type is not None:
+            return format_type, True
+
+    return "unknown", False
@@ -2,14 +2,84 @@
 Abstract base class for Vision-Language Models used in MOT data extraction.
 """
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
+import atexit
 import base64
-from PIL import Image
-import io
+import httpx
 
 
-@dataclass
+# Dedicated executors instead of asyncio's default pool (whose size is
+# derived from the CPU count). GPU work must be single-threaded — more
+# workers just contend on the CUDA context — while image decode can use
+# a modest CPU-bound pool.
+GPU_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="florence-gpu")
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="vision-io")
+
+atexit.register(GPU_EXECUTOR.shutdown, wait=False)
+atexit.register(IO_EXECUTOR.shutdown, wait=False)
+
+
+# Field sets checked per extraction; issubset makes each membership pass
+# a single C-level set comparison
+# JPEG start-of-frame markers that carry the image dimensions (all SOFn
+# except the DHT/DAC/arithmetic markers sharing the 0xC0 range)
+_JPEG_SOF_MARKERS = frozenset(
+    range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _sniff_jpeg_dimensions(image_path: str) -> Optional[tuple]:
+    """Read (width, height) from a JPEG's SOF marker without decoding.
+
+    Walks the marker segments at the head of the file — typically well
+    under 1KB of reads — and returns None for non-JPEG files or anything
+    that does not parse cleanly, in which case callers fall back to PIL.
+    """
+    try:
+        with open(image_path, 'rb') as f:
+            if f.read(2) != b'\xff\xd8':
+                return None
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                code = marker[1]
+                # Skip fill bytes before the marker code
+                while code == 0xFF:
+                    nxt = f.read(1)
+                    if not nxt:
+                        return None
+                    code = nxt[0]
+                if code in _JPEG_SOF_MARKERS:
+                    segment = f.read(7)
+                    if len(segment) < 7:
+                        return None
+                    height = int.from_bytes(segment[3:5], 'big')
+                    width = int.from_bytes(segment[5:7], 'big')
+                    return (width, height)
+                if code == 0xD9 or 0xD0 <= code <= 0xD8 or code == 0x01:
+                    # Standalone markers carry no length field
+                    continue
+                length = int.from_bytes(f.read(2), 'big')
+                if length < 2:
+                    return None
+                f.seek(length - 2, 1)
+    except OSError:
+        return None
+
+
+_CONFIDENCE_FIELDS = frozenset((
+    'registration', 'mot_expiry', 'make', 'model',
+    'customer_name', 'customer_phone', 'customer_email'
+))
+_REQUIRED_FIELDS = _CONFIDENCE_FIELDS | {'confidence_scores'}
+
+
+# slots=True drops the per-instance __dict__ (results are created in
+# volume, one per model per request) and frozen=True lets consensus code
+# share result objects across tasks without defensive copies
+@dataclass(slots=True, frozen=True)
 class ExtractionResult:
     """Result from vision model extraction."""
     registration: str
@@ -27,6 +97,58 @@ class ExtractionResult:
 
 
 @dataclass
+class ExtractionResultBatch:
+    """Column-oriented view over many extraction results.
+
+    Batch consumers that only need one or two fields (e.g. validators
+    reading registrations and MOT expiries) can stream a single column
+    instead of touching every attribute of every result object.
+    """
+    registrations: List[str]
+    mot_expiries: List[str]
+    makes: List[str]
+    models: List[str]
+    customer_names: List[str]
+    customer_phones: List[str]
+    customer_emails: List[str]
+    confidence_scores: List[Dict[str, float]]
+    software_detected: List[str]
+    raw_responses: List[str]
+    processing_times: List[float]
+    model_names: List[str]
+
+    @classmethod
+    def from_list(cls, results: List[ExtractionResult]) -> "ExtractionResultBatch":
+        """Build the columnar batch from a list of ExtractionResults."""
+        return cls(
+            registrations=[r.registration for r in results],
+            mot_expiries=[r.mot_expiry for r in results],
+            makes=[r.make for r in results],
+            models=[r.model for r in results],
+            customer_names=[r.customer_name for r in results],
+            customer_phones=[r.customer_phone for r in results],
+            customer_emails=[r.customer_email for r in results],
+            confidence_scores=[r.confidence_scores for r in results],
+            software_detected=[r.software_detected for r in results],
+            raw_responses=[r.raw_response for r in results],
+            processing_times=[r.processing_time for r in results],
+            model_names=[r.model_name for r in results],
+        )
+
+    def to_list(self) -> List[ExtractionResult]:
+        """Materialize the batch back into ExtractionResult objects."""
+        return [
+            ExtractionResult(*row)
+            for row in zip(
+                self.registrations, self.mot_expiries, self.makes, self.models,
+                self.customer_names, self.customer_phones, self.customer_emails,
+                self.confidence_scores, self.software_detected,
+                self.raw_responses, self.processing_times, self.model_names,
+            )
+        ]
+
+
+@dataclass(slots=True, frozen=True)
 class ModelConfig:
     """Configuration for vision models."""
     api_key: str
@@ -34,23 +156,41 @@ class ModelConfig:
     max_tokens: int = 4096
     temperature: float = 0.1
     timeout: int = 60
+    # Micro-batching knobs for local GPU models: requests arriving within
+    # max_delay_ms of each other are coalesced into one forward pass of up
+    # to batch_size images
+    batch_size: int = 4
+    max_delay_ms: int = 10
+    # Beam width for local generation; OCR transcription is effectively
+    # deterministic, so greedy decoding is the default
+    num_beams: int = 1
+    # Stream API completions and return as soon as the JSON payload
+    # closes, instead of waiting for the full response
+    stream: bool = False
 
 
 class BaseVisionModel(ABC):
     """Abstract base class for vision-language models."""
     
-    def __init__(self, config: ModelConfig):
+    def __init__(self, config: ModelConfig, http_client: Optional[httpx.AsyncClient] = None):
         self.config = config
         self.model_name = config.model_name
+        # Shared HTTP connection pool injected by the pipeline; models whose
+        # SDKs accept an external client reuse its keepalive connections
+        self.http_client = http_client
         
     @abstractmethod
-    async def extract_mot_data(self, image_path: str) -> ExtractionResult:
+    async def extract_mot_data(
+        self, image_path: str, image_b64: Optional[str] = None
+    ) -> ExtractionResult:
         """
         Extract MOT data from garage management software screenshot.
-        
+
         Args:
             image_path: Path to the screenshot image
-            
+            image_b64: Optional pre-encoded base64 JPEG of the image; models
+                that send base64 payloads use it instead of re-encoding
+
         Returns:
             ExtractionResult with extracted data and confidence scores
         """
@@ -82,34 +222,83 @@ class BaseVisionModel(ABC):
         """
         pass
     
-    def _encode_image_base64(self, image_path: str, max_size: tuple = (2048, 2048)) -> str:
+    @staticmethod
+    def _encode_image_base64(
+        image_path: str,
+        max_size: tuple = (2048, 2048),
+        short_side: Optional[int] = None
+    ) -> str:
         """
         Encode image to base64 with optional resizing.
-        
+
         Args:
             image_path: Path to the image
             max_size: Maximum dimensions (width, height)
-            
+            short_side: Optional cap on the shorter dimension; models that
+                tile their input (e.g. GPT-4V's 768px short side) gain
+                nothing from extra pixels beyond it
+
         Returns:
             Base64 encoded image string
         """
+        # Magic-byte fast path: if the file is already a JPEG whose
+        # dimensions sit within every bound, the original bytes are
+        # exactly what would be sent — base64 them directly and skip the
+        # full decode + resample + re-encode cycle. PNG sources always
+        # need the transcode to JPEG, so only JPEGs qualify.
+        dims = _sniff_jpeg_dimensions(image_path)
+        if dims is not None:
+            width, height = dims
+            if (0 < width <= max_size[0] and 0 < height <= max_size[1]
+                    and (short_side is None
+                         or min(width, height) <= short_side)):
+                with open(image_path, 'rb') as f:
+                    return base64.b64encode(f.read()).decode('ascii')
+
+        # PIL and io are only needed on this path; importing lazily keeps
+        # module import cheap for models that never encode base64
+        import io
+        from PIL import Image
+
         try:
             with Image.open(image_path) as img:
+                # JPEG sources can be decoded straight to a smaller size
+                # via DCT scaling; ask for ~2x the target so the final
+                # thumbnail still has headroom for a clean resample
+                if img.format == 'JPEG' and (
+                        img.size[0] > max_size[0] * 2 or
+                        img.size[1] > max_size[1] * 2):
+                    img.draft('RGB', (max_size[0] * 2, max_size[1] * 2))
+
                 # Convert to RGB if necessary
                 if img.mode != 'RGB':
                     img = img.convert('RGB')
-                
-                # Resize if too large
-                if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
-                    img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                
-                # Convert to base64
+
+                # Resize if too large; for heavy downscales BILINEAR is
+                # indistinguishable for OCR-grade screenshots and costs a
+                # fraction of LANCZOS per pixel
+                width, height = img.size
+                scale = min(max_size[0] / width, max_size[1] / height, 1.0)
+                if short_side is not None:
+                    scale = min(scale, short_side / min(width, height))
+                if scale < 1.0:
+                    resample = (Image.Resampling.BILINEAR if scale < 0.5
+                                else Image.Resampling.LANCZOS)
+                    img = img.resize(
+                        (max(1, round(width * scale)), max(1, round(height * scale))),
+                        resample
+                    )
+
+                # Convert to base64; skip the optional second encode pass
+                # and keep baseline (non-progressive) output
                 buffer = io.BytesIO()
-                img.save(buffer, format='JPEG', quality=95)
-                img_bytes = buffer.getvalue()
-                
-                return base64.b64encode(img_bytes).decode('utf-8')
-                
+                img.save(buffer, format='JPEG', quality=95,
+                         optimize=False, progressive=False, subsampling=2)
+
+                # Encode straight from the buffer's memoryview: getvalue()
+                # would copy the multi-MB JPEG once more before encoding
+                return base64.b64encode(buffer.getbuffer()).decode('ascii')
+
         except Exception as e:
             raise ValueError(f"Failed to encode image: {str(e)}")
     
@@ -123,34 +312,20 @@ class BaseVisionModel(ABC):
         Returns:
             True if valid, False otherwise
         """
-        required_fields = [
-            'registration', 'mot_expiry', 'make', 'model',
-            'customer_name', 'customer_phone', 'customer_email',
-            'confidence_scores'
-        ]
-        
-        for field in required_fields:
-            if field not in data:
-                return False
-                
+        if not _REQUIRED_FIELDS.issubset(data):
+            return False
+
         # Validate confidence_scores structure
-        if not isinstance(data['confidence_scores'], dict):
+        confidence_scores = data['confidence_scores']
+        if not isinstance(confidence_scores, dict):
             return False
-            
-        confidence_fields = [
-            'registration', 'mot_expiry', 'make', 'model',
-            'customer_name', 'customer_phone', 'customer_email'
-        ]
-        
-        for field in confidence_fields:
-            if field not in data['confidence_scores']:
-                return False
-            if not isinstance(data['confidence_scores'][field], (int, float)):
-                return False
-            if not 0 <= data['confidence_scores'][field] <= 1:
-                return False
-                
-        return True
+        if not _CONFIDENCE_FIELDS.issubset(confidence_scores):
+            return False
+
+        return all(
+            isinstance(score, (int, float)) and 0 <= score <= 1
+            for score in (confidence_scores[field] for field in _CONFIDENCE_FIELDS)
+        )
     
     def _create_extraction_result(
         self, 
@@ -2,81 +2,72 @@
 Claude 3.5 Sonnet Vision implementation for MOT data extraction.
 """
 import json
+import os
 import time
 import asyncio
+from functools import lru_cache
 from typing import Dict, Any
 import anthropic
-from .base_vision_model import BaseVisionModel, ExtractionResult, ModelConfig, VisionModelError, VisionModelAPIError
+from .base_vision_model import (
+    BaseVisionModel, ExtractionResult, ModelConfig, VisionModelError,
+    VisionModelAPIError, IO_EXECUTOR
+)
+from .prompts import CLAUDE_EXTRACTION_PROMPT
 
+# Shared decoder: raw_decode parses straight from the first '{' and stops
+# at the object's end, so no rfind scan or sliced copy of the response
+_JSON_DECODER = json.JSONDecoder()
 
-class ClaudeVisionModel(BaseVisionModel):
-    """Claude 3.5 Sonnet Vision model for MOT data extraction."""
-    
-    EXTRACTION_PROMPT = """
-You are an expert at extracting MOT reminder data from garage management software screenshots with extreme precision.
 
-Analyze this screenshot and extract the following information:
+@lru_cache(maxsize=128)
+def _cached_encode(image_path: str, mtime_ns: int, max_width: int, max_height: int) -> str:
+    """Encode an image to base64, memoized on path and mtime.
 
-1. Vehicle Registration Number (UK format: AB12 CDE, A123 BCD, etc.)
-2. MOT Expiry Date (DD/MM/YYYY format)
-3. Vehicle Make
-4. Vehicle Model  
-5. Customer Name
-6. Customer Phone Number
-7. Customer Email Address
+    Retries and repeated extractions of the same file become a dict hit
+    instead of a JPEG decode + resize + encode; mtime_ns in the key means
+    an overwritten file is re-encoded.
+    """
+    return BaseVisionModel._encode_image_base64(
+        image_path, max_size=(max_width, max_height)
+    )
 
-CRITICAL REQUIREMENTS:
-- UK registration numbers follow specific patterns (AB12 CDE, A123 BCD, ABC 123D, 1234 AB)
-- Dates must be in DD/MM/YYYY format
-- If any field is unclear, missing, or you're not confident, use "NOT_FOUND"
-- Provide confidence score (0.0-1.0) for each field based on clarity and certainty
-- Try to identify the garage management software being used
 
-IMPORTANT: Look carefully at the entire screenshot. Data might be in tables, forms, or scattered across the interface.
-
-Return ONLY a valid JSON object with this exact structure:
-{
-    "registration": "extracted_registration_or_NOT_FOUND",
-    "mot_expiry": "DD/MM/YYYY_or_NOT_FOUND", 
-    "make": "extracted_make_or_NOT_FOUND",
-    "model": "extracted_model_or_NOT_FOUND",
-    "customer_name": "extracted_name_or_NOT_FOUND",
-    "customer_phone": "extracted_phone_or_NOT_FOUND",
-    "customer_email": "extracted_email_or_NOT_FOUND",
-    "confidence_scores": {
-        "registration": 0.0,
-        "mot_expiry": 0.0,
-        "make": 0.0,
-        "model": 0.0,
-        "customer_name": 0.0,
-        "customer_phone": 0.0,
-        "customer_email": 0.0
-    },
-    "software_detected": "detected_software_name_or_UNKNOWN"
-}
+class ClaudeVisionModel(BaseVisionModel):
+    """Claude 3.5 Sonnet Vision model for MOT data extraction."""
 
-Do not include any text before or after the JSON object.
-"""
-    
-    def __init__(self, config: ModelConfig):
-        super().__init__(config)
-        self.client = anthropic.Anthropic(api_key=config.api_key)
+    def __init__(self, config: ModelConfig, http_client=None):
+        super().__init__(config, http_client=http_client)
+        # Native async client: requests share the event loop's connection
+        # pool instead of occupying thread-pool workers, so in-flight
+        # concurrency is bounded by provider rate limits, not thread count
+        self.client = anthropic.AsyncAnthropic(
+            api_key=config.api_key,
+            http_client=http_client
+        )
     
-    async def extract_mot_data(self, image_path: str) -> ExtractionResult:
+    async def extract_mot_data(self, image_path: str, image_b64: str = None) -> ExtractionResult:
         """
         Extract MOT data using Claude 3.5 Sonnet Vision.
-        
+
         Args:
             image_path: Path to the screenshot image
-            
+            image_b64: Optional pre-encoded base64 JPEG, reused as-is
+
         Returns:
             ExtractionResult with extracted data and confidence scores
         """
         start_time = time.time()
-        
+
         try:
-            # Prepare image
-            image_data = self._prepare_image(image_path)
+            # Prepare image (reuse the shared encoding when provided);
+            # the encode behind _prepare_image runs on the IO pool so it
+            # cannot stall other in-flight calls
+            if image_b64 is not None:
+                image_data = image_b64
+            else:
+                image_data = await asyncio.get_event_loop().run_in_executor(
+                    IO_EXECUTOR, self._prepare_image, image_path
+                )
             
             # Create message with image
             message = await self._call_claude_api(image_data)
@@ -106,7 +97,9 @@ Do not include any text before or after the JSON object.
         Returns:
             Base64 encoded image string
         """
-        return self._encode_image_base64(image_path, max_size=(2048, 2048))
+        return _cached_encode(
+            image_path, os.stat(image_path).st_mtime_ns, 2048, 2048
+        )
     
     async def _call_claude_api(self, image_data: str) -> Any:
         """
@@ -119,37 +112,40 @@ Do not include any text before or after the JSON object.
             Claude API response
         """
         try:
-            # Run the synchronous API call in a thread pool
-            loop = asyncio.get_event_loop()
-            message = await loop.run_in_executor(
-                None,
-                lambda: self.client.messages.create(
-                    model=self.config.model_name,
-                    max_tokens=self.config.max_tokens,
-                    temperature=self.config.temperature,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "image",
-                                    "source": {
-                                        "type": "base64",
-                                        "media_type": "image/jpeg",
-                                        "data": image_data
-                                    }
-                                },
-                                {
-                                    "type": "text",
-                                    "text": self.EXTRACTION_PROMPT
+            # Await the async client directly; no executor round-trip.
+            # The constant prompt rides as a cache-controlled system block
+            # so the API reuses its prefill across requests; only the
+            # image varies per call.
+            message = await self.client.messages.create(
+                model=self.config.model_name,
+                max_tokens=self.config.max_tokens,
+                temperature=self.config.temperature,
+                system=[
+                    {
+                        "type": "text",
+                        "text": CLAUDE_EXTRACTION_PROMPT,
+                        "cache_control": {"type": "ephemeral"}
+                    }
+                ],
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "image",
+                                "source": {
+                                    "type": "base64",
+                                    "media_type": "image/jpeg",
+                                    "data": image_data
                                 }
-                            ]
-                        }
-                    ]
-                )
+                            }
+                        ]
+                    }
+                ],
+                extra_headers={"anthropic-beta": "prompt-caching-2024-07-31"}
             )
             return message
-            
+
         except anthropic.APIError as e:
             raise VisionModelAPIError(f"Claude API error: {str(e)}") from e
         except Exception as e:
@@ -166,19 +162,14 @@ Do not include any text before or after the JSON object.
             Parsed data dictionary
         """
         try:
-            # Clean the response - remove any text before/after JSON
-            response = response.strip()
-            
-            # Find JSON object boundaries
+            # Parse directly from the first '{'; any trailing text after
+            # the JSON object is ignored without scanning for it
             start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            
-            if start_idx == -1 or end_idx == 0:
+            if start_idx == -1:
                 raise ValueError("No JSON object found in response")
-            
-            json_str = response[start_idx:end_idx]
-            data = json.loads(json_str)
-            
+
+            data, _ = _JSON_DECODER.raw_decode(response, start_idx)
+
             # Validate the response structure
             if not self._validate_extraction_result(data):
                 raise ValueError("Invalid response structure from Claude")
@@ -2,23 +2,80 @@
 Microsoft Florence-2 implementation for MOT data extraction.
 """
 import json
+import re
 import time
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, List
+import numpy as np
 import torch
+import torch.nn.functional as F
 from transformers import AutoProcessor, AutoModelForCausalLM
 from PIL import Image
-from .base_vision_model import BaseVisionModel, ExtractionResult, ModelConfig, VisionModelError
+from .base_vision_model import (
+    BaseVisionModel, ExtractionResult, ModelConfig, VisionModelError,
+    GPU_EXECUTOR, IO_EXECUTOR
+)
+
+# Vehicle makes in recognition-priority order: when several appear in the
+# OCR text, the earliest entry here wins, not the earliest position
+_MAKES = (
+    'FORD', 'VAUXHALL', 'BMW', 'AUDI', 'MERCEDES', 'VOLKSWAGEN',
+    'TOYOTA', 'HONDA', 'NISSAN', 'PEUGEOT', 'RENAULT', 'CITROEN',
+    'HYUNDAI', 'KIA', 'MAZDA', 'SUBARU', 'VOLVO', 'JAGUAR',
+    'LAND ROVER', 'MINI', 'FIAT', 'ALFA ROMEO', 'SEAT', 'SKODA',
+)
+
+# Registration format groups in priority order: a current-format plate
+# anywhere in the text beats a dateless-format candidate that happens to
+# appear earlier
+_REG_GROUP_PRIORITY = ('reg_current', 'reg_prefix', 'reg_suffix', 'reg_dateless')
+
+# All field families fused into a single alternation compiled at import —
+# the closest stdlib equivalent of a multi-pattern DFA scan. One pass of
+# finditer routes matches to fields via their named group, instead of one
+# full scan of the OCR text per field. Registration formats and makes keep
+# separate identities so the post-scan selection can apply priority order
+# rather than position order.
+_FIELDS_RE = re.compile(
+    r'\b(?:'
+    r'(?P<reg_current>[A-Z]{2}[0-9]{2}\s?[A-Z]{3})'   # Current format
+    r'|(?P<reg_prefix>[A-Z][0-9]{1,3}\s?[A-Z]{3})'    # Prefix format
+    r'|(?P<reg_suffix>[A-Z]{3}\s?[0-9]{1,3}[A-Z])'    # Suffix format
+    r'|(?P<reg_dateless>[0-9]{1,4}\s?[A-Z]{1,3})'     # Dateless format
+    r'|(?P<mot_expiry>\d{2}(?P<_sep>[/\-.])\d{2}(?P=_sep)\d{4})'
+    r'|(?P<customer_email>[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})'
+    r'|(?P<customer_phone>(?:0|\+44)[1-9]\d{8,9}|07\d{9})'
+    r'|(?P<make>' + '|'.join(_MAKES) + r')'
+    r')\b',
+    re.IGNORECASE
+)
+
+# Heuristic confidence assigned to the first match of each field
+_FIELD_CONFIDENCE = {
+    'registration': 0.8,
+    'mot_expiry': 0.7,
+    'customer_email': 0.9,
+    'customer_phone': 0.8,
+    'make': 0.7,
+}
 
 
 class FlorenceVisionModel(BaseVisionModel):
     """Microsoft Florence-2 model for MOT data extraction."""
-    
+
+    # Largest number of images fed through one generate call; bounds peak
+    # GPU memory while still amortizing the forward pass across the batch
+    MAX_INFERENCE_BATCH_SIZE = 8
+
     def __init__(self, config: ModelConfig):
         super().__init__(config)
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.processor = None
         self.model = None
+        # Micro-batching state; the queue and worker task are created
+        # lazily on the first request so __init__ needs no running loop
+        self._batch_queue = None
+        self._batch_worker_task = None
         self._initialize_model()
     
     def _initialize_model(self):
@@ -28,31 +85,72 @@ class FlorenceVisionModel(BaseVisionModel):
                 self.config.model_name, 
                 trust_remote_code=True
             )
+            # Prefer bf16 on GPUs that support it: same bandwidth as fp16
+            # with fp32's exponent range, so no loss-of-range surprises
+            if self.device == "cuda":
+                dtype = (torch.bfloat16 if torch.cuda.is_bf16_supported()
+                         else torch.float16)
+            else:
+                dtype = torch.float32
+
             self.model = AutoModelForCausalLM.from_pretrained(
-                self.config.model_name, 
+                self.config.model_name,
                 trust_remote_code=True,
-                torch_dtype=torch.float16 if self.device == "cuda" else torch.float32
+                torch_dtype=dtype
             ).to(self.device)
-            
+
+            if self.device == "cuda":
+                # Best-effort kernel fusion; remote-code models do not
+                # always compile, and eager mode is a fine fallback
+                try:
+                    self.model = torch.compile(self.model, mode="reduce-overhead")
+                except Exception:
+                    pass
+
+            # The <OCR> prompt never changes; tokenize it once here so the
+            # per-request path only runs the image processor
+            self._ocr_input_ids = self.processor.tokenizer(
+                "<OCR>", return_tensors="pt"
+            ).input_ids.to(self.device)
+
+            # Normalization constants for the on-device preprocessing
+            # path, pulled from the processor so they stay in sync
+            image_processor = self.processor.image_processor
+            self._image_size = (
+                image_processor.size['height'],
+                image_processor.size['width']
+            )
+            self._image_mean = torch.tensor(
+                image_processor.image_mean, device=self.device
+            ).view(3, 1, 1)
+            self._image_std = torch.tensor(
+                image_processor.image_std, device=self.device
+            ).view(3, 1, 1)
+
         except Exception as e:
             raise VisionModelError(f"Failed to initialize Florence-2 model: {str(e)}")
     
-    async def extract_mot_data(self, image_path: str) -> ExtractionResult:
+    async def extract_mot_data(self, image_path: str, image_b64: str = None) -> ExtractionResult:
         """
         Extract MOT data using Florence-2.
-        
+
         Args:
             image_path: Path to the screenshot image
-            
+            image_b64: Unused; Florence-2 runs on PIL images rather than base64
+
         Returns:
             ExtractionResult with extracted data and confidence scores
         """
         start_time = time.time()
-        
+
         try:
-            # Prepare image
-            image = self._prepare_image(image_path)
-            
+            # Prepare image on the IO pool; decode of one request overlaps
+            # with GPU inference of the previous batch instead of blocking
+            # the event loop
+            image = await asyncio.get_event_loop().run_in_executor(
+                IO_EXECUTOR, self._prepare_image, image_path
+            )
+
             # Extract text using Florence-2
             extracted_text = await self._extract_text_with_florence(image)
             
@@ -70,7 +168,59 @@ class FlorenceVisionModel(BaseVisionModel):
         except Exception as e:
             processing_time = time.time() - start_time
             raise VisionModelError(f"Florence-2 extraction failed: {str(e)}") from e
-    
+
+    async def extract_mot_data_batch(self, image_paths: List[str]) -> List[ExtractionResult]:
+        """
+        Extract MOT data from several screenshots in one batched pass.
+
+        Stacks the images and runs a single generate call per batch, so N
+        screenshots cost one forward pass instead of N serial ones. Batches
+        are capped at MAX_INFERENCE_BATCH_SIZE to bound GPU memory.
+
+        Args:
+            image_paths: Paths to the screenshot images
+
+        Returns:
+            List of ExtractionResults in input order
+        """
+        if not image_paths:
+            return []
+
+        loop = asyncio.get_event_loop()
+
+        # Decode images concurrently on the IO pool while the GPU is free
+        images = await asyncio.gather(*(
+            loop.run_in_executor(IO_EXECUTOR, self._prepare_image, path)
+            for path in image_paths
+        ))
+
+        task_prompt = "<OCR>"
+        results = []
+        for start in range(0, len(images), self.MAX_INFERENCE_BATCH_SIZE):
+            chunk = images[start:start + self.MAX_INFERENCE_BATCH_SIZE]
+            batch_start = time.time()
+
+            extracted_texts = await loop.run_in_executor(
+                GPU_EXECUTOR,
+                self._run_florence_inference_batch,
+                chunk,
+                task_prompt
+            )
+
+            # The batch shares one forward pass; attribute an equal slice
+            # of the elapsed time to each image
+            processing_time = (time.time() - batch_start) / len(chunk)
+
+            for extracted_text in extracted_texts:
+                parsed_data = self._parse_extracted_text(extracted_text)
+                results.append(self._create_extraction_result(
+                    parsed_data,
+                    extracted_text,
+                    processing_time
+                ))
+
+        return results
+
     def _prepare_image(self, image_path: str) -> Image.Image:
         """
         Prepare image for Florence-2.
@@ -96,31 +246,129 @@ class FlorenceVisionModel(BaseVisionModel):
     async def _extract_text_with_florence(self, image: Image.Image) -> str:
         """
         Extract text using Florence-2 OCR capabilities.
-        
+
+        Requests are routed through the micro-batching queue so concurrent
+        callers share one GPU forward pass instead of queueing serially.
+
         Args:
             image: PIL Image object
-            
+
         Returns:
             Extracted text
         """
         try:
-            # Use Florence-2 for OCR task
-            task_prompt = "<OCR>"
-            
-            # Run inference in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                self._run_florence_inference,
-                image,
-                task_prompt
-            )
-            
-            return result
-            
+            self._ensure_batch_worker()
+
+            future = asyncio.get_event_loop().create_future()
+            await self._batch_queue.put((image, future))
+
+            return await future
+
+        except VisionModelError:
+            raise
         except Exception as e:
             raise VisionModelError(f"Florence-2 text extraction failed: {str(e)}")
+
+    def _ensure_batch_worker(self):
+        """Start the batching worker on first use (requires a running loop)."""
+        if self._batch_worker_task is None or self._batch_worker_task.done():
+            self._batch_queue = asyncio.Queue()
+            self._batch_worker_task = asyncio.get_event_loop().create_task(
+                self._batch_worker()
+            )
+
+    async def _batch_worker(self):
+        """
+        Coalesce queued requests into batched GPU calls.
+
+        Blocks for the first request, then drains further requests until
+        either the batch is full or max_delay_ms has passed since the
+        first arrival — so a lone request only waits the delay window and
+        a burst fills the batch immediately.
+        """
+        loop = asyncio.get_event_loop()
+        max_delay = self.config.max_delay_ms / 1000.0
+
+        while True:
+            batch = [await self._batch_queue.get()]
+            deadline = loop.time() + max_delay
+
+            while len(batch) < self.config.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(
+                        self._batch_queue.get(), timeout=remaining
+                    ))
+                except asyncio.TimeoutError:
+                    break
+
+            images = [image for image, _ in batch]
+            try:
+                extracted_texts = await loop.run_in_executor(
+                    GPU_EXECUTOR,
+                    self._run_florence_inference_batch,
+                    images,
+                    "<OCR>"
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(
+                            VisionModelError(f"Florence-2 inference failed: {str(e)}")
+                        )
+                continue
+
+            for (_, future), text in zip(batch, extracted_texts):
+                if not future.done():
+                    future.set_result(text)
     
+    def _pixel_values_for(self, images: List[Image.Image]) -> torch.Tensor:
+        """
+        Build the pixel_values batch for a list of PIL images.
+
+        On CUDA, each image is copied to the device raw and resized +
+        normalized with tensor ops there, instead of running the HF image
+        processor's numpy pipeline on the CPU and copying the result. On
+        CPU the stock processor path is used.
+
+        Args:
+            images: PIL Image objects
+
+        Returns:
+            pixel_values tensor on the model's device and dtype
+        """
+        if self.device != "cuda":
+            return self.processor.image_processor(
+                list(images),
+                return_tensors="pt"
+            )["pixel_values"]
+
+        rows = []
+        for image in images:
+            tensor = torch.from_numpy(
+                np.asarray(image, dtype=np.uint8)
+            ).permute(2, 0, 1).contiguous()
+            # Pinned (page-locked) staging lets the H2D copy run async;
+            # with non_blocking it overlaps the previous image's resize
+            # kernels instead of stalling until the bus is free
+            tensor = tensor.pin_memory().to(
+                self.device, non_blocking=True
+            ).float().div_(255.0)
+            rows.append(F.interpolate(
+                tensor.unsqueeze(0),
+                size=self._image_size,
+                mode='bicubic',
+                align_corners=False,
+                antialias=True
+            ))
+
+        batch = torch.cat(rows)
+        batch.sub_(self._image_mean).div_(self._image_std)
+        # Match the model's dtype (bf16/fp16 on GPU)
+        return batch.to(self.model.dtype)
+
     def _run_florence_inference(self, image: Image.Image, task_prompt: str) -> str:
         """
         Run Florence-2 inference synchronously.
@@ -133,21 +381,21 @@ class FlorenceVisionModel(BaseVisionModel):
             Extracted text
         """
         try:
-            # Prepare inputs
-            inputs = self.processor(
-                text=task_prompt, 
-                images=image, 
-                return_tensors="pt"
-            ).to(self.device)
-            
-            # Generate
-            with torch.no_grad():
+            # Only the image is preprocessed; the prompt's input_ids were
+            # cached at init
+            pixel_values = self._pixel_values_for([image])
+
+            # Generate; inference_mode also skips autograd's version
+            # counter and view tracking that no_grad still pays for
+            with torch.inference_mode():
                 generated_ids = self.model.generate(
-                    input_ids=inputs["input_ids"],
-                    pixel_values=inputs["pixel_values"],
+                    input_ids=self._ocr_input_ids,
+                    pixel_values=pixel_values,
                     max_new_tokens=1024,
-                    num_beams=3,
-                    do_sample=False
+                    num_beams=self.config.num_beams,
+                    do_sample=False,
+                    use_cache=True,
+                    pad_token_id=self.processor.tokenizer.eos_token_id
                 )
             
             # Decode
@@ -167,7 +415,56 @@ class FlorenceVisionModel(BaseVisionModel):
             
         except Exception as e:
             raise VisionModelError(f"Florence-2 inference failed: {str(e)}")
-    
+
+    def _run_florence_inference_batch(self, images: List[Image.Image], task_prompt: str) -> List[str]:
+        """
+        Run Florence-2 inference over a stack of images in one generate call.
+
+        Args:
+            images: PIL Image objects forming the batch
+            task_prompt: Task prompt for Florence-2 (shared across the batch)
+
+        Returns:
+            Extracted text per image, in input order
+        """
+        try:
+            # Only the images are preprocessed; the shared prompt's cached
+            # input_ids are broadcast across the batch (expand is a view,
+            # not a copy)
+            pixel_values = self._pixel_values_for(list(images))
+            input_ids = self._ocr_input_ids.expand(len(images), -1)
+
+            # Generate for the whole batch at once
+            with torch.inference_mode():
+                generated_ids = self.model.generate(
+                    input_ids=input_ids,
+                    pixel_values=pixel_values,
+                    max_new_tokens=1024,
+                    num_beams=self.config.num_beams,
+                    do_sample=False,
+                    use_cache=True,
+                    pad_token_id=self.processor.tokenizer.eos_token_id
+                )
+
+            # Decode
+            generated_texts = self.processor.batch_decode(
+                generated_ids,
+                skip_special_tokens=False
+            )
+
+            # Post-process each row against its own image size
+            return [
+                self.processor.post_process_generation(
+                    generated_text,
+                    task=task_prompt,
+                    image_size=(image.width, image.height)
+                ).get(task_prompt, "")
+                for generated_text, image in zip(generated_texts, images)
+            ]
+
+        except Exception as e:
+            raise VisionModelError(f"Florence-2 batch inference failed: {str(e)}")
+
     def _parse_extracted_text(self, text: str) -> Dict[str, Any]:
         """
         Parse extracted text into structured MOT data.
@@ -178,8 +475,6 @@ class FlorenceVisionModel(BaseVisionModel):
         Returns:
             Parsed data dictionary
         """
-        import re
-        
         # Initialize result structure
         result = {
             "registration": "NOT_FOUND",
@@ -204,72 +499,51 @@ class FlorenceVisionModel(BaseVisionModel):
         if not text:
             return result
         
-        # UK Registration patterns
-        reg_patterns = [
-            r'\b[A-Z]{2}[0-9]{2}\s?[A-Z]{3}\b',  # Current format
-            r'\b[A-Z][0-9]{1,3}\s?[A-Z]{3}\b',   # Prefix format
-            r'\b[A-Z]{3}\s?[0-9]{1,3}[A-Z]\b',   # Suffix format
-            r'\b[0-9]{1,4}\s?[A-Z]{1,3}\b'       # Dateless format
-        ]
-        
-        # Search for registration
-        for pattern in reg_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                result["registration"] = match.group().upper()
-                result["confidence_scores"]["registration"] = 0.8
-                break
-        
-        # Date patterns
-        date_patterns = [
-            r'\b\d{2}/\d{2}/\d{4}\b',
-            r'\b\d{2}-\d{2}-\d{4}\b',
-            r'\b\d{2}\.\d{2}\.\d{4}\b'
-        ]
-        
-        # Search for MOT expiry date
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
-            if match:
-                result["mot_expiry"] = match.group()
-                result["confidence_scores"]["mot_expiry"] = 0.7
+        # One pass over the text collects every candidate. Positional
+        # fields (date, email, phone) take their first match directly;
+        # registration and make record what they saw so the selection
+        # below can apply format/list priority, matching the per-field
+        # scan order the fused regex replaced.
+        remaining = {'mot_expiry', 'customer_email', 'customer_phone'}
+        reg_seen = {}
+        makes_seen = set()
+        for match in _FIELDS_RE.finditer(text):
+            for group in _REG_GROUP_PRIORITY:
+                if match.group(group) is not None:
+                    reg_seen.setdefault(group, match.group(group))
+                    break
+            else:
+                make = match.group('make')
+                if make is not None:
+                    makes_seen.add(make.upper())
+                    continue
+                for field in remaining:
+                    if match.group(field) is not None:
+                        result[field] = match.group(field)
+                        result["confidence_scores"][field] = _FIELD_CONFIDENCE[field]
+                        break
+                else:
+                    continue
+                remaining.discard(field)
+
+            # Everything left can only be displaced by a lower-priority
+            # candidate, so the rest of the text cannot change the result
+            if not remaining and 'reg_current' in reg_seen and _MAKES[0] in makes_seen:
                 break
-        
-        # Email pattern
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
-        if email_match:
-            result["customer_email"] = email_match.group()
-            result["confidence_scores"]["customer_email"] = 0.9
-        
-        # Phone pattern (UK)
-        phone_patterns = [
-            r'\b(?:0|\+44)[1-9]\d{8,9}\b',
-            r'\b07\d{9}\b'
-        ]
-        
-        for pattern in phone_patterns:
-            match = re.search(pattern, text)
-            if match:
-                result["customer_phone"] = match.group()
-                result["confidence_scores"]["customer_phone"] = 0.8
+
+        for group in _REG_GROUP_PRIORITY:
+            if group in reg_seen:
+                result["registration"] = reg_seen[group].upper()
+                result["confidence_scores"]["registration"] = _FIELD_CONFIDENCE['registration']
                 break
-        
-        # Vehicle make detection (common UK makes)
-        makes = [
-            "FORD", "VAUXHALL", "BMW", "AUDI", "MERCEDES", "VOLKSWAGEN",
-            "TOYOTA", "HONDA", "NISSAN", "PEUGEOT", "RENAULT", "CITROEN",
-            "HYUNDAI", "KIA", "MAZDA", "SUBARU", "VOLVO", "JAGUAR",
-            "LAND ROVER", "MINI", "FIAT", "ALFA ROMEO", "SEAT", "SKODA"
-        ]
-        
-        for make in makes:
-            if make in text.upper():
+
+        for make in _MAKES:
+            if make in makes_seen:
                 result["make"] = make
-                result["confidence_scores"]["make"] = 0.7
+                result["confidence_scores"]["make"] = _FIELD_CONFIDENCE['make']
                 break
-        
-        # Software detection
+
+        # Software detection; lowercase once instead of per indicator
         software_indicators = {
             "garage hive": "garage_hive",
             "autotrader": "autotrader_pro",
@@ -277,12 +551,13 @@ class FlorenceVisionModel(BaseVisionModel):
             "techman": "techman",
             "motasoft": "motasoft"
         }
-        
+
+        lowered = text.lower()
         for indicator, software in software_indicators.items():
-            if indicator in text.lower():
+            if indicator in lowered:
                 result["software_detected"] = software
                 break
-        
+
         return result
     
     def get_model_info(self) -> Dict[str, Any]:
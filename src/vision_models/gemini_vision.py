@@ -1,81 +1,78 @@
 """
 Google Gemini Pro Vision implementation for MOT data extraction.
 """
+import io
 import json
+import os
 import time
 import asyncio
+from functools import lru_cache
 from typing import Dict, Any
 import google.generativeai as genai
 from PIL import Image
-from .base_vision_model import BaseVisionModel, ExtractionResult, ModelConfig, VisionModelError, VisionModelAPIError
+from .base_vision_model import (
+    BaseVisionModel, ExtractionResult, ModelConfig, VisionModelError,
+    VisionModelAPIError, IO_EXECUTOR
+)
+from .prompts import GEMINI_EXTRACTION_PROMPT
+
+# Shared decoder: raw_decode parses straight from the first '{' and stops
+# at the object's end, so no rfind scan or sliced copy of the response
+_JSON_DECODER = json.JSONDecoder()
+
+
+@lru_cache(maxsize=128)
+def _cached_prepare_bytes(image_path: str, mtime_ns: int) -> bytes:
+    """Load, convert and resize an image, memoized on path and mtime.
+
+    The resized result is cached as JPEG bytes (PIL images are mutable,
+    so caching the Image itself would be unsafe); reopening from bytes
+    is cheap next to the LANCZOS resize it avoids. mtime_ns in the key
+    means an overwritten file is re-prepared.
+    """
+    image = Image.open(image_path)
+
+    # Convert to RGB if necessary
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    # Resize if too large
+    max_size = (2048, 2048)
+    if image.size[0] > max_size[0] or image.size[1] > max_size[1]:
+        image.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=95)
+    return buffer.getvalue()
 
 
 class GeminiVisionModel(BaseVisionModel):
     """Google Gemini Pro Vision model for MOT data extraction."""
-    
-    EXTRACTION_PROMPT = """
-Analyze this garage management software screenshot and extract MOT reminder data with high precision.
-
-Extract the following information:
-1. UK Vehicle Registration Number (formats: AB12 CDE, A123 BCD, ABC 123D, 1234 AB)
-2. MOT Expiry Date (DD/MM/YYYY format preferred)
-3. Vehicle Make
-4. Vehicle Model
-5. Customer Name
-6. Customer Phone Number
-7. Customer Email Address
-
-CRITICAL REQUIREMENTS:
-- UK registration numbers must follow specific patterns
-- Dates should be in DD/MM/YYYY format
-- If any field is unclear or missing, use "NOT_FOUND"
-- Provide confidence score (0.0-1.0) for each field
-- Examine the entire screenshot carefully
-
-Return ONLY a valid JSON object with this structure:
-{
-    "registration": "extracted_registration_or_NOT_FOUND",
-    "mot_expiry": "DD/MM/YYYY_or_NOT_FOUND",
-    "make": "extracted_make_or_NOT_FOUND",
-    "model": "extracted_model_or_NOT_FOUND",
-    "customer_name": "extracted_name_or_NOT_FOUND",
-    "customer_phone": "extracted_phone_or_NOT_FOUND",
-    "customer_email": "extracted_email_or_NOT_FOUND",
-    "confidence_scores": {
-        "registration": 0.0,
-        "mot_expiry": 0.0,
-        "make": 0.0,
-        "model": 0.0,
-        "customer_name": 0.0,
-        "customer_phone": 0.0,
-        "customer_email": 0.0
-    },
-    "software_detected": "detected_software_name_or_UNKNOWN"
-}
-
-Do not include any text before or after the JSON object.
-"""
-    
+
     def __init__(self, config: ModelConfig):
         super().__init__(config)
         genai.configure(api_key=config.api_key)
         self.model = genai.GenerativeModel(config.model_name)
     
-    async def extract_mot_data(self, image_path: str) -> ExtractionResult:
+    async def extract_mot_data(self, image_path: str, image_b64: str = None) -> ExtractionResult:
         """
         Extract MOT data using Gemini Pro Vision.
-        
+
         Args:
             image_path: Path to the screenshot image
-            
+            image_b64: Unused; Gemini takes PIL images rather than base64
+
         Returns:
             ExtractionResult with extracted data and confidence scores
         """
         start_time = time.time()
         
         try:
-            # Prepare image
-            image = self._prepare_image(image_path)
+            # Prepare image on the IO pool; the decode/resize behind it
+            # cannot stall other in-flight calls
+            image = await asyncio.get_event_loop().run_in_executor(
+                IO_EXECUTOR, self._prepare_image, image_path
+            )
             
             # Generate content with image and prompt
             response = await self._call_gemini_api(image)
@@ -106,19 +103,11 @@ Do not include any text before or after the JSON object.
             PIL Image object
         """
         try:
-            image = Image.open(image_path)
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Resize if too large
-            max_size = (2048, 2048)
-            if image.size[0] > max_size[0] or image.size[1] > max_size[1]:
-                image.thumbnail(max_size, Image.Resampling.LANCZOS)
-            
-            return image
-            
+            prepared = _cached_prepare_bytes(
+                image_path, os.stat(image_path).st_mtime_ns
+            )
+            return Image.open(io.BytesIO(prepared))
+
         except Exception as e:
             raise ValueError(f"Failed to prepare image: {str(e)}")
     
@@ -133,15 +122,14 @@ Do not include any text before or after the JSON object.
             Gemini API response
         """
         try:
-            # Run the synchronous API call in a thread pool
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.model.generate_content([self.EXTRACTION_PROMPT, image])
+            # Native async call; runs on the SDK's shared connection pool
+            # instead of a thread-pool worker
+            response = await self.model.generate_content_async(
+                [GEMINI_EXTRACTION_PROMPT, image]
             )
-            
+
             return response
-            
+
         except Exception as e:
             raise VisionModelAPIError(f"Gemini API error: {str(e)}") from e
     
@@ -156,19 +144,14 @@ Do not include any text before or after the JSON object.
             Parsed data dictionary
         """
         try:
-            # Clean the response - remove any text before/after JSON
-            response = response.strip()
-            
-            # Find JSON object boundaries
+            # Parse directly from the first '{'; any trailing text after
+            # the JSON object is ignored without scanning for it
             start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            
-            if start_idx == -1 or end_idx == 0:
+            if start_idx == -1:
                 raise ValueError("No JSON object found in response")
-            
-            json_str = response[start_idx:end_idx]
-            data = json.loads(json_str)
-            
+
+            data, _ = _JSON_DECODER.raw_decode(response, start_idx)
+
             # Validate the response structure
             if not self._validate_extraction_result(data):
                 raise ValueError("Invalid response structure from Gemini")
@@ -0,0 +1,82 @@
+"""
+Shared extraction prompts for the vision-language models.
+
+Module-level Final constants: every request references the one interned
+string (no per-instance or class-dict lookup on the hot path), and the
+JSON contract both prompts embed is written exactly once.
+"""
+from typing import Final
+
+# The JSON structure the models must return; identical across providers
+_JSON_STRUCTURE: Final[str] = """{
+    "registration": "extracted_registration_or_NOT_FOUND",
+    "mot_expiry": "DD/MM/YYYY_or_NOT_FOUND",
+    "make": "extracted_make_or_NOT_FOUND",
+    "model": "extracted_model_or_NOT_FOUND",
+    "customer_name": "extracted_name_or_NOT_FOUND",
+    "customer_phone": "extracted_phone_or_NOT_FOUND",
+    "customer_email": "extracted_email_or_NOT_FOUND",
+    "confidence_scores": {
+        "registration": 0.0,
+        "mot_expiry": 0.0,
+        "make": 0.0,
+        "model": 0.0,
+        "customer_name": 0.0,
+        "customer_phone": 0.0,
+        "customer_email": 0.0
+    },
+    "software_detected": "detected_software_name_or_UNKNOWN"
+}"""
+
+CLAUDE_EXTRACTION_PROMPT: Final[str] = f"""
+You are an expert at extracting MOT reminder data from garage management software screenshots with extreme precision.
+
+Analyze this screenshot and extract the following information:
+
+1. Vehicle Registration Number (UK format: AB12 CDE, A123 BCD, etc.)
+2. MOT Expiry Date (DD/MM/YYYY format)
+3. Vehicle Make
+4. Vehicle Model
+5. Customer Name
+6. Customer Phone Number
+7. Customer Email Address
+
+CRITICAL REQUIREMENTS:
+- UK registration numbers follow specific patterns (AB12 CDE, A123 BCD, ABC 123D, 1234 AB)
+- Dates must be in DD/MM/YYYY format
+- If any field is unclear, missing, or you're not confident, use "NOT_FOUND"
+- Provide confidence score (0.0-1.0) for each field based on clarity and certainty
+- Try to identify the garage management software being used
+
+IMPORTANT: Look carefully at the entire screenshot. Data might be in tables, forms, or scattered across the interface.
+
+Return ONLY a valid JSON object with this exact structure:
+{_JSON_STRUCTURE}
+
+Do not include any text before or after the JSON object.
+"""
+
+GEMINI_EXTRACTION_PROMPT: Final[str] = f"""
+Analyze this garage management software screenshot and extract MOT reminder data with high precision.
+
+Extract the following information:
+1. UK Vehicle Registration Number (formats: AB12 CDE, A123 BCD, ABC 123D, 1234 AB)
+2. MOT Expiry Date (DD/MM/YYYY format preferred)
+3. Vehicle Make
+4. Vehicle Model
+5. Customer Name
+6. Customer Phone Number
+7. Customer Email Address
+
+CRITICAL REQUIREMENTS:
+- UK registration numbers must follow specific patterns
+- Dates should be in DD/MM/YYYY format
+- If any field is unclear or missing, use "NOT_FOUND"
+- Provide confidence score (0.0-1.0) for each field
+- Examine the entire screenshot carefully
+
+Return ONLY a valid JSON object with this structure:
+{_JSON_STRUCTURE}
+
+Do not include any text before or after the JSON object.
+"""
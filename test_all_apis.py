@@ -7,6 +7,7 @@ import asyncio
 import sys
 import os
 import time
+import types
 from pathlib import Path
 
 # Add src to Python path
@@ -18,6 +19,17 @@ from src.utils.logger import setup_logger
 # Setup logging
 logger = setup_logger(__name__)
 
+# Snapshot the API keys once at import: every later check is a plain
+# dict lookup instead of going back through os.environ, and the proxy
+# keeps the snapshot read-only
+_ENV = types.MappingProxyType({
+    key: os.environ.get(key)
+    for key in (
+        "ANTHROPIC_API_KEY", "OPENAI_API_KEY",
+        "GOOGLE_API_KEY", "DVLA_API_KEY"
+    )
+})
+
 
 async def test_claude_api():
     """Test Claude 3.5 Sonnet Vision API."""
@@ -26,7 +38,7 @@ async def test_claude_api():
     try:
         from src.vision_models.claude_vision import ClaudeVisionModel
         
-        api_key = os.getenv("ANTHROPIC_API_KEY")
+        api_key = _ENV["ANTHROPIC_API_KEY"]
         if not api_key:
             logger.warning("❌ ANTHROPIC_API_KEY not found - skipping Claude test")
             return False
@@ -62,7 +74,7 @@ async def test_gpt4v_api():
     try:
         from src.vision_models.gpt4_vision import GPT4VisionModel
         
-        api_key = os.getenv("OPENAI_API_KEY")
+        api_key = _ENV["OPENAI_API_KEY"]
         if not api_key:
             logger.warning("❌ OPENAI_API_KEY not found - skipping GPT-4V test")
             return False
@@ -98,7 +110,7 @@ async def test_gemini_api():
     try:
         from src.vision_models.gemini_vision import GeminiVisionModel
         
-        api_key = os.getenv("GOOGLE_API_KEY")
+        api_key = _ENV["GOOGLE_API_KEY"]
         if not api_key:
             logger.warning("❌ GOOGLE_API_KEY not found - skipping Gemini test")
             return False
@@ -166,7 +178,7 @@ async def test_dvla_api():
     try:
         from src.dvla.api_client import DVLAAPIClient
         
-        api_key = os.getenv("DVLA_API_KEY")
+        api_key = _ENV["DVLA_API_KEY"]
         if not api_key:
             logger.warning("❌ DVLA_API_KEY not found - skipping DVLA test")
             return False
@@ -229,7 +241,7 @@ def check_environment_variables():
     
     found_vars = 0
     for var, description in required_vars.items():
-        if os.getenv(var):
+        if _ENV[var]:
             logger.info(f"✅ {var} configured for {description}")
             found_vars += 1
         else:
@@ -260,13 +272,20 @@ async def run_comprehensive_api_test():
         ("Ensemble Pipeline", test_ensemble_pipeline())
     ]
     
+    # Run all tests concurrently; they are independent init/IO work, so
+    # the harness takes as long as the slowest test instead of the sum
+    outcomes = await asyncio.gather(
+        *(test_coro for _, test_coro in tests),
+        return_exceptions=True
+    )
+
     results = {}
-    for name, test_coro in tests:
-        try:
-            results[name] = await test_coro
-        except Exception as e:
-            logger.error(f"❌ {name} test crashed: {str(e)}")
+    for (name, _), outcome in zip(tests, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"❌ {name} test crashed: {str(outcome)}")
             results[name] = False
+        else:
+            results[name] = outcome
     
     # Summary
     total_time = time.time() - start_time
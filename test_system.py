@@ -34,8 +34,11 @@ async def test_validation_components():
     ]
     
     logger.info("Testing UK Registration Validator:")
-    for reg in test_registrations:
-        result = reg_validator.validate_registration(reg)
+    # Validate as one batch: the production path feeds extracted fields
+    # through the same API, which shares one reference year and
+    # deduplicates repeats across the batch
+    for reg, result in zip(test_registrations,
+                           reg_validator.validate_batch(test_registrations)):
         logger.info(f"  {reg}: Valid={result.is_valid}, Format={result.format_type}, Confidence={result.confidence_score:.2f}")
     
     # Test Date Validator
@@ -51,23 +54,32 @@ async def test_validation_components():
     ]
     
     logger.info("\nTesting Date Validator:")
-    for date_str in test_dates:
-        result = date_validator.validate_date(date_str)
+    for date_str, result in zip(test_dates,
+                                date_validator.validate_dates(test_dates)):
         logger.info(f"  {date_str}: Valid={result.is_valid}, Parsed={result.normalized_date}, Confidence={result.confidence_score:.2f}")
 
 
 async def test_api_availability():
     """Test if required APIs are available."""
     logger.info("Testing API availability...")
-    
+
     import os
-    
-    # Check environment variables
+    import types
+
+    # Snapshot once into a read-only mapping; each service check is
+    # then a plain dict lookup rather than an os.environ round trip
+    env = types.MappingProxyType({
+        key: os.environ.get(key)
+        for key in (
+            "ANTHROPIC_API_KEY", "OPENAI_API_KEY",
+            "GOOGLE_API_KEY", "DVLA_API_KEY"
+        )
+    })
     api_keys = {
-        "Anthropic": os.getenv("ANTHROPIC_API_KEY"),
-        "OpenAI": os.getenv("OPENAI_API_KEY"),
-        "Google": os.getenv("GOOGLE_API_KEY"),
-        "DVLA": os.getenv("DVLA_API_KEY"),
+        "Anthropic": env["ANTHROPIC_API_KEY"],
+        "OpenAI": env["OPENAI_API_KEY"],
+        "Google": env["GOOGLE_API_KEY"],
+        "DVLA": env["DVLA_API_KEY"],
     }
     
     for service, key in api_keys.items():